@@ -0,0 +1,42 @@
+"""Integer UTC day helpers for bar loops.
+
+Strategies bucket governor state by UTC day. Formatting a date string per bar
+(datetime + strftime) is the slowest thing in those loops, so we work with
+integer day ids (ts // 86400) and precomputed day boundaries instead. Session
+windows likewise become per-bar masks over the integer minute of day.
+
+Timestamps are unix seconds, sorted ascending (the CSV loaders guarantee this).
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import List, Sequence, Tuple
+
+SECONDS_PER_DAY = 86400
+MINUTES_PER_DAY = 1440
+
+
+def day_spans(ts: Sequence[int], start: int = 0) -> List[Tuple[int, int]]:
+    """Return [begin, end) bar index ranges, one per UTC day, covering ts[start:]."""
+    spans: List[Tuple[int, int]] = []
+    n = len(ts)
+    begin = start
+    while begin < n:
+        next_day_ts = (ts[begin] // SECONDS_PER_DAY + 1) * SECONDS_PER_DAY
+        end = bisect_left(ts, next_day_ts, begin + 1, n)
+        spans.append((begin, end))
+        begin = end
+    return spans
+
+
+def minute_of_day(ts: Sequence[int]) -> List[int]:
+    """UTC minute of day (0..1439) per bar; same value as hour*60+minute of utcfromtimestamp."""
+    return [(t // 60) % MINUTES_PER_DAY for t in ts]
+
+
+def session_mask(minutes: Sequence[int], start_min_utc: int, end_min_utc: int) -> List[bool]:
+    """Per-bar session flag with inclusive bounds; start > end wraps past midnight."""
+    if start_min_utc <= end_min_utc:
+        return [start_min_utc <= m <= end_min_utc for m in minutes]
+    return [m >= start_min_utc or m <= end_min_utc for m in minutes]
@@ -13,7 +13,7 @@ from typing import Dict, List, Optional
 import random
 
 from trading.backtest_harness.eval_attempt import AttemptResult, simulate_eval_attempt_daily
-from trading.prop.lucid_black_25k.risk_governor import Lucid25kRules
+from trading.prop.lucid_black_25k.risk_governor import Lucid25kRules, default_rules
 
 
 @dataclass(frozen=True)
@@ -47,7 +47,7 @@ def run_eval_batch(
     max_days: int = 5,
     seed: int = 1,
 ) -> BatchSummary:
-    rules = rules or Lucid25kRules()
+    rules = rules or default_rules()
     rng = random.Random(seed)
 
     passed = 0
@@ -15,20 +15,21 @@ from __future__ import annotations
 from collections import Counter, defaultdict
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
-from trading.backtest_harness.tv_csv import Candle
-from trading.prop.lucid_black_25k.risk_governor import Lucid25kRules, step_eod_drawdown, is_consistency_ok
+from trading.backtest_harness.tv_csv import Candle, CandleArrays
+from trading.prop.lucid_black_25k.risk_governor import Lucid25kRules, step_eod_drawdown, is_consistency_ok, default_rules
 
 
 def day_key(ts: int) -> str:
     return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%d")
 
 
-def build_day_index(candles: Sequence[Candle]) -> Tuple[List[str], Dict[str, Tuple[int, int]]]:
+def build_day_index(candles: Union[Sequence[Candle], CandleArrays]) -> Tuple[List[str], Dict[str, Tuple[int, int]]]:
+    ts = candles.ts if isinstance(candles, CandleArrays) else [c.ts for c in candles]
     start_end: Dict[str, List[int]] = {}
-    for i, c in enumerate(candles):
-        d = day_key(c.ts)
+    for i, t in enumerate(ts):
+        d = day_key(t)
         if d not in start_end:
             start_end[d] = [i, i]
         else:
@@ -64,7 +65,7 @@ def simulate_path(
     absent from the candle series.)
     """
 
-    rules = rules or Lucid25kRules()
+    rules = rules or default_rules()
     tlist = sorted(list(trades), key=lambda t: t.exit_ts)
 
     # bucket trades by exit-day
@@ -111,14 +112,22 @@ def simulate_path(
 
 
 def days_to_pass_distribution(
-    candles: Sequence[Candle],
-    gen_trades: Callable[[List[Candle]], Sequence],
+    candles: Union[Sequence[Candle], CandleArrays],
+    gen_trades: Callable[[Union[List[Candle], CandleArrays]], Sequence],
     rules: Optional[Lucid25kRules] = None,
     daily_profit_cap: float = 750.0,
     daily_loss_cap: Optional[float] = 300.0,
     max_days: int = 30,
 ) -> Dict:
-    rules = rules or Lucid25kRules()
+    """Summary of simulate_path over every start day.
+
+    CandleArrays input hands gen_trades CandleArrays windows (column slices) instead of
+    List[Candle], so the strategy needs to accept those.
+
+    Returned as a plain dict because the searches json.dump it into their artifacts as
+    is: "outcomes" only has the outcomes that occurred, "pass_days_hist" is {days: count}.
+    """
+    rules = rules or default_rules()
     days, idx = build_day_index(candles)
 
     pass_days = Counter()
@@ -129,7 +138,11 @@ def days_to_pass_distribution(
 
     for s in range(len(days)):
         start_i = idx[days[s]][0]
-        sub = list(candles[start_i:])
+        # simulate_path only reads trades exiting in the first max_days days and the
+        # strategies only look backwards, so the window stops there rather than at the
+        # end of data: indicators/bar loop run over max_days of bars per start day.
+        end_i = idx[days[s + max_days]][0] if s + max_days < len(days) else len(candles)
+        sub = candles.window(start_i, end_i) if isinstance(candles, CandleArrays) else list(candles[start_i:end_i])
         trades = list(gen_trades(sub))
         res = simulate_path(
             trades,
@@ -13,6 +13,7 @@ from typing import List, Literal, Optional
 
 from trading.prop.lucid_black_25k.risk_governor import (
     Lucid25kRules,
+    default_rules,
     is_consistency_ok,
     step_eod_drawdown,
 )
@@ -55,7 +56,7 @@ def simulate_eval_attempt_daily(
     - Profit target hit
     """
 
-    rules = rules or Lucid25kRules()
+    rules = rules or default_rules()
     n = min(len(day_profits), max_days)
 
     closes: List[float] = []
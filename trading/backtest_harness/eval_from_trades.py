@@ -19,7 +19,7 @@ from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Iterable, List, Optional, Tuple
 
-from trading.prop.lucid_black_25k.risk_governor import Lucid25kRules, step_eod_drawdown, is_consistency_ok
+from trading.prop.lucid_black_25k.risk_governor import Lucid25kRules, step_eod_drawdown, is_consistency_ok, default_rules
 
 
 @dataclass
@@ -44,7 +44,7 @@ def simulate_eval_from_trades(
     daily_profit_cap: float = 750.0,
     daily_loss_cap: Optional[float] = None,
 ) -> EvalSimResult:
-    rules = rules or Lucid25kRules()
+    rules = rules or default_rules()
 
     # group trades by exit day in chronological order
     tlist = sorted(list(trades), key=lambda t: t.exit_ts)
@@ -18,12 +18,12 @@ _REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")
 if _REPO_ROOT not in sys.path:
     sys.path.insert(0, _REPO_ROOT)
 
-import json
 import random
 import time
 
 from trading.backtest_harness.tv_csv import load_tradingview_ohlc_csv
 from trading.backtest_harness.days_to_pass import days_to_pass_distribution
+from trading.backtest_harness.search_ckpt import CheckpointThrottle, SeenCfgs, write_json_atomic
 from trading.backtest_harness.strategy_v2 import Params, Filters, Governor, Breakout, ORB, Session, Exits, generate_trades
 
 
@@ -63,10 +63,16 @@ def main():
     checkpoint_path = "trading/backtest_harness/best_v2_overnight_ckpt.json"
 
     n = 0
-    t0 = time.time()
+    t0 = time.monotonic()
+    ckpt_due = CheckpointThrottle()
+    seen = SeenCfgs()
     while True:
-        n += 1
         cfg = {k: random.choice(v) for k, v in choices.items()}
+        if not seen.add(tuple(cfg.values())):
+            if seen.exhausted:
+                break
+            continue
+        n += 1
         p = Params(
             risk_per_trade_dollars=cfg["risk"],
             atr_mult=cfg["atr_mult"],
@@ -101,30 +107,29 @@ def main():
 
         cand = (score, pass5r, mll, timeout, cfg, out)
 
-        # Always checkpoint current result so a reboot doesn't erase all progress.
-        ckpt = {
-            "updatedAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-            "iterations": n,
-            "elapsed_s": round(time.time() - t0, 1),
-            "current": {
-                "score": score,
-                "pass5_rate": pass5r,
-                "mll_rate": mll,
-                "timeout_rate": timeout,
-                "cfg": cfg,
-                "outcomes": out["outcomes"],
-                "pass_days_hist": out["pass_days_hist"],
-            },
-        }
-        with open(checkpoint_path, "w") as f:
-            json.dump(ckpt, f, indent=2)
+        # Checkpoint the current result (throttled) so a reboot doesn't erase all progress.
+        if ckpt_due.due(n):
+            ckpt = {
+                "updatedAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "iterations": n,
+                "elapsed_s": round(time.monotonic() - t0, 1),
+                "current": {
+                    "score": score,
+                    "pass5_rate": pass5r,
+                    "mll_rate": mll,
+                    "timeout_rate": timeout,
+                    "cfg": cfg,
+                    "outcomes": out["outcomes"],
+                },
+            }
+            write_json_atomic(checkpoint_path, ckpt, separators=(",", ":"))
 
         if best is None or cand[:4] > best[:4]:
             best = cand
             payload = {
                 "updatedAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
                 "iterations": n,
-                "elapsed_s": round(time.time() - t0, 1),
+                "elapsed_s": round(time.monotonic() - t0, 1),
                 "score": best[0],
                 "pass5_rate": best[1],
                 "mll_rate": best[2],
@@ -133,8 +138,7 @@ def main():
                 "outcomes": best[5]["outcomes"],
                 "pass_days_hist": best[5]["pass_days_hist"],
             }
-            with open(out_path, "w") as f:
-                json.dump(payload, f, indent=2)
+            write_json_atomic(out_path, payload, indent=2)
 
         if n % 10 == 0:
             # Light progress logging to stdout.
@@ -0,0 +1,54 @@
+"""Run one strategy over many Params on the same candle series.
+
+Each backtest is independent, so a sweep can fan out over a process pool.
+Default is workers=1 (in-process), which is what SAFE_MODE.md allows; only
+raise it with explicit approval.
+
+Candles are converted to CandleArrays once. In-process this lets the
+strategy_v0 indicator memo reuse EMA/ATR series across params; with a pool,
+each worker receives the columns once (initializer) and then only Params.
+
+No external deps.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence, Union
+
+from trading.backtest_harness.tv_csv import Candle, CandleArrays, candles_to_arrays
+
+GenerateTrades = Callable[[CandleArrays, Any], List[Any]]
+
+_worker_fn: Optional[GenerateTrades] = None
+_worker_cols: Optional[CandleArrays] = None
+
+
+def _init_worker(fn: GenerateTrades, cols: CandleArrays) -> None:
+    global _worker_fn, _worker_cols
+    _worker_fn = fn
+    _worker_cols = cols
+
+
+def _run_one(p: Any) -> List[Any]:
+    return _worker_fn(_worker_cols, p)
+
+
+def generate_trades_batch(
+    generate_trades: GenerateTrades,
+    candles: Union[List[Candle], CandleArrays],
+    params: Sequence[Any],
+    workers: int = 1,
+) -> List[List[Any]]:
+    """Trades for each Params, in input order.
+
+    generate_trades must be a module-level function accepting CandleArrays
+    (e.g. strategy_v7_regime_switch.generate_trades) so it can be pickled.
+    """
+    cols = candles if isinstance(candles, CandleArrays) else candles_to_arrays(candles)
+    if workers <= 1 or len(params) <= 1:
+        return [generate_trades(cols, p) for p in params]
+
+    chunksize = max(1, len(params) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(generate_trades, cols)) as ex:
+        return list(ex.map(_run_one, params, chunksize=chunksize))
@@ -17,7 +17,7 @@ from datetime import datetime, timezone
 from typing import Callable, Dict, List, Sequence, Tuple
 
 from trading.backtest_harness.tv_csv import Candle
-from trading.prop.lucid_black_25k.risk_governor import Lucid25kRules
+from trading.prop.lucid_black_25k.risk_governor import Lucid25kRules, default_rules
 from trading.backtest_harness.eval_attempt import simulate_eval_attempt_daily, AttemptResult
 from trading.backtest_harness.eval_from_trades import simulate_eval_from_trades
 
@@ -57,7 +57,7 @@ def rolling_eval_5day(
     daily_loss_cap: float | None = None,
     use_trade_stream: bool = True,
 ) -> RollingSummary:
-    rules = rules or Lucid25kRules()
+    rules = rules or default_rules()
 
     days, idx = build_day_index(candles)
     windows = 0
@@ -0,0 +1,92 @@
+"""Checkpoint writes, cfg bookkeeping and run caps for the long-running search scripts (v4/v5/overnight).
+
+Files are written to <path>.tmp and swapped in with os.replace, so a crash or
+reboot mid-write leaves the previous checkpoint intact instead of a truncated one.
+
+No external deps.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from typing import Any, Dict, Hashable
+
+
+def write_json_atomic(path: str, obj: Any, **dump_kw: Any) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(obj, f, **dump_kw)
+    os.replace(tmp, path)
+
+
+class CheckpointThrottle:
+    """due(n) is True every `every` iterations, or once `seconds` have passed since the last True."""
+
+    def __init__(self, every: int = 50, seconds: float = 10.0):
+        self.every = every
+        self.seconds = seconds
+        self._last = time.monotonic()
+
+    def due(self, n: int) -> bool:
+        now = time.monotonic()
+        if n % self.every == 0 or now - self._last >= self.seconds:
+            self._last = now
+            return True
+        return False
+
+
+class SeenCfgs:
+    """Keys of cfgs already scored, so random searches skip repeats.
+
+    A repeat scores the same and can't replace best (the searches compare with strict >).
+    Holds at most max_size keys, dropping the oldest first; an evicted cfg may be scored
+    again, which only costs time. add() returns False for a repeat; `exhausted` turns True
+    after max_repeats repeat draws in a row, i.e. the space is (nearly) covered and the
+    loop should stop instead of spinning without scoring anything.
+    """
+
+    def __init__(self, max_size: int = 200_000, max_repeats: int = 1000):
+        self.max_size = max_size
+        self.max_repeats = max_repeats
+        self._keys: Dict[Hashable, None] = {}
+        self._repeats = 0
+
+    def add(self, key: Hashable) -> bool:
+        if key in self._keys:
+            self._repeats += 1
+            return False
+        self._repeats = 0
+        if len(self._keys) >= self.max_size:
+            del self._keys[next(iter(self._keys))]
+        self._keys[key] = None
+        return True
+
+    @property
+    def exhausted(self) -> bool:
+        return self._repeats >= self.max_repeats
+
+
+class RunCaps:
+    """Optional MAX_ITERS / MAX_SECONDS caps on a search loop (0 = no limit).
+
+    SAFE_MODE.md asks for bounded runs locally. The clock starts when the caps are
+    read. A loop that ends on a cap (or SeenCfgs.exhausted) stops mid-throttle, so
+    the script should write one last checkpoint after it.
+    """
+
+    def __init__(self, max_iters: int = 0, max_seconds: float = 0.0):
+        self.max_iters = max_iters
+        self.max_seconds = max_seconds
+        self._t0 = time.monotonic()
+
+    @classmethod
+    def from_env(cls) -> RunCaps:
+        return cls(int(os.environ.get("MAX_ITERS", "0")), float(os.environ.get("MAX_SECONDS", "0")))
+
+    def reached(self, n: int) -> bool:
+        """True once n iterations or max_seconds are used up."""
+        if self.max_iters and n >= self.max_iters:
+            return True
+        return bool(self.max_seconds) and time.monotonic() - self._t0 >= self.max_seconds
@@ -14,7 +14,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import List, Optional
 
-from trading.prop.lucid_black_25k.risk_governor import Lucid25kRules, Mode, is_consistency_ok
+from trading.prop.lucid_black_25k.risk_governor import Lucid25kRules, Mode, is_consistency_ok, default_rules
 
 
 @dataclass(frozen=True)
@@ -42,7 +42,7 @@ def simulate_eval_attempt(
     validate consistency + profit-target pacing.
     """
 
-    rules = rules or Lucid25kRules()
+    rules = rules or default_rules()
 
     total = 0.0
     largest = 0.0
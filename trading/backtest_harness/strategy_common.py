@@ -0,0 +1,316 @@
+"""Shared pieces of the v7/v8/v9 strategies: Trade, sizing, the signals memo and the bar loop.
+
+Each strategy precomputes its per-bar signals (see its _build_signals) and hands
+them to run_bars, which owns position management, exits and the daily governor.
+Trade, calc_qty and the time helpers used to live in each strategy module; those
+modules still import them from here so old imports keep working.
+
+Research harness only. No external deps.
+"""
+
+from __future__ import annotations
+
+import datetime
+import math
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Generic, Hashable, List, Literal, Optional, Sequence, TypeVar
+
+from trading.backtest_harness.bar_time import day_spans
+from trading.backtest_harness.tv_csv import CandleArrays
+from trading.backtest_harness.strategy_v0 import _DOLLARS_PER_POINT, TICK_VALUE
+
+Side = Literal["long", "short"]
+
+# position state inside the bar loop; Trade.side keeps the string form
+FLAT, LONG, SHORT = 0, 1, -1
+_SIDE_NAME = {LONG: "long", SHORT: "short"}
+
+
+def minutes_utc(ts: int) -> int:
+    d = datetime.datetime.utcfromtimestamp(ts)
+    return d.hour * 60 + d.minute
+
+
+def in_session(ts: int, start_min_utc: int, end_min_utc: int) -> bool:
+    m = minutes_utc(ts)
+    if start_min_utc <= end_min_utc:
+        return start_min_utc <= m <= end_min_utc
+    return m >= start_min_utc or m <= end_min_utc
+
+
+def day_key_utc(ts: int) -> str:
+    return datetime.datetime.utcfromtimestamp(ts).strftime("%Y-%m-%d")
+
+
+@dataclass(frozen=True, slots=True)
+class Trade:
+    side: Side
+    qty: int
+    entry_ts: int
+    exit_ts: int
+    entry: float
+    exit: float
+    sl: float
+    tp: float
+    pnl_dollars: float
+
+
+def calc_qty(stop_dist_points: float, risk_per_trade_dollars: float, max_micros: int) -> int:
+    # $ risk per micro, floored at one tick. stop_dist is ATR * mult, not a whole tick
+    # count, so a qty-per-tick table would round it and change sizing; it's per entry anyway.
+    risk_per_micro = stop_dist_points * _DOLLARS_PER_POINT
+    if not risk_per_micro > TICK_VALUE:
+        risk_per_micro = TICK_VALUE
+    qty = int(risk_per_trade_dollars // risk_per_micro)
+    if qty < 1:
+        qty = 1
+    return max_micros if qty > max_micros else qty
+
+
+S = TypeVar("S")
+
+
+class SignalsMemo(Generic[S]):
+    """Signals for the most recent CandleArrays, keyed by key(p).
+
+    key(p) resets the Params fields the signals don't depend on, so sweeps that only
+    vary exits/governor/sizing reuse them. Bounded so entry-param sweeps don't pile
+    up memory.
+    """
+
+    def __init__(self, build: Callable[[CandleArrays, Any], S], key: Callable[[Any], Hashable], max_entries: int = 8):
+        self._build = build
+        self._key = key
+        self._max_entries = max_entries
+        self._src: Optional[CandleArrays] = None
+        self._memo: Dict[Hashable, S] = {}
+
+    def get(self, cols: CandleArrays, p: Any) -> S:
+        if cols is not self._src:
+            self._memo.clear()
+            self._src = cols
+        key = self._key(p)
+        sig = self._memo.get(key)
+        if sig is None:
+            sig = self._build(cols, p)
+            if len(self._memo) >= self._max_entries:
+                del self._memo[next(iter(self._memo))]
+            self._memo[key] = sig
+        return sig
+
+
+@dataclass(frozen=True)
+class ExitSpec:
+    """Exit settings of one regime, with the ATR series they're measured in."""
+    ax: List[Optional[float]]
+    stop_atr_mult: float
+    trail_atr_mult: float
+    tp_atr_mult: Optional[float]  # None => TP at 3x the stop distance
+    max_hold_bars: int
+
+
+@dataclass(frozen=True)
+class DayRules:
+    max_trades_per_day: int
+    max_losses_per_day: int
+    daily_loss_stop: float
+    cooldown_bars_after_loss: int
+    stop_after_first_loss: bool = False
+    daily_profit_target_base: float = math.inf
+    daily_profit_target_press: float = math.inf
+
+
+def run_bars(
+    ts: List[int],
+    opens: List[float],
+    highs: List[float],
+    lows: List[float],
+    closes: List[float],
+    gate: List[bool],
+    long_sig: List[bool],
+    short_sig: List[bool],
+    exits: Sequence[ExitSpec],
+    rules: DayRules,
+    risk: float,
+    max_micros: int,
+    exit_slot: Optional[List[int]] = None,
+    crossed: Optional[List[bool]] = None,
+    pull_long: Optional[List[bool]] = None,
+    pull_short: Optional[List[bool]] = None,
+    pull_gap: Optional[List[Optional[int]]] = None,
+    press_sess: Optional[List[bool]] = None,
+) -> List[Trade]:
+    """Bar loop over per-bar columns only (no Candle access inside the loop).
+
+    Signal bar j = i-1 enters at open[i] when gate[j] and long_sig/short_sig fire.
+    exit_slot[j] picks the ExitSpec for that entry (None = exits[0]).
+    crossed/pull_*/pull_gap: pullback fallback when no primary signal fires, taken once
+    pull_gap[j] bars have passed since the last gated close-vs-fast-EMA cross (None = off).
+    press_sess[k]: a winning first trade entered at bar k raises the daily target to press
+    (None = any winning first trade does).
+    """
+    # bind what the loop reads to locals once
+    max_trades = rules.max_trades_per_day
+    max_losses = rules.max_losses_per_day
+    loss_floor = -abs(rules.daily_loss_stop)
+    cooldown_len = rules.cooldown_bars_after_loss
+    stop_after_first_loss = rules.stop_after_first_loss
+    target_base = abs(rules.daily_profit_target_base)
+    target_press = abs(rules.daily_profit_target_press)
+    press_anywhere = press_sess is None
+
+    # Plain append on purpose: a preallocated [None] * (days * max_trades) buffer with an
+    # index counter measured ~1.6x slower per store in CPython, and trades are rare next to bars.
+    trades: List[Trade] = []
+    add_trade = trades.append
+
+    in_pos = FLAT
+    # exit settings of the open position's regime
+    pos_ax: List[Optional[float]] = exits[0].ax
+    pos_trail_mult = 0.0
+    pos_max_hold = 0
+    qty = 0
+    entry_i = -1
+    entry_px = 0.0
+    sl = 0.0
+    tp = 0.0
+    # Open position in signed price space (s = float(in_pos)): s*price grows in the
+    # position's favour, so long and short share one set of comparisons. Negation is
+    # exact, so this matches the per-side max/min formulation bit for bit.
+    s = 1.0
+    fav_col = highs
+    adv_col = lows
+    entry_s = 0.0
+    sl_s = 0.0
+    tp_s = 0.0
+    trail_s = 0.0
+
+    last_cross_i = -999999
+
+    for day_begin, day_end in day_spans(ts, 2):
+        # governor state per day
+        trades_today = 0
+        losses_today = 0
+        day_pnl = 0.0
+        cooldown = 0
+        stop_for_day = False
+        press_mode = False
+        first_trade_done = False
+
+        for i in range(day_begin, day_end):
+            if cooldown > 0:
+                cooldown -= 1
+
+            # manage open
+            if in_pos != FLAT:
+                fav = s * fav_col[i]
+                adv = s * adv_col[i]
+
+                if pos_ax[i] is not None:
+                    trail_s = max(trail_s, fav - pos_ax[i] * pos_trail_mult)
+                    sl_eff_s = max(sl_s, trail_s)
+                else:
+                    sl_eff_s = sl_s
+
+                # SL wins when both are touched in the same bar (conservative)
+                if adv <= sl_eff_s:
+                    exit_s = sl_eff_s
+                elif fav >= tp_s:
+                    exit_s = tp_s
+                elif (i - entry_i) >= pos_max_hold:
+                    exit_s = s * closes[i]
+                else:
+                    continue
+
+                exit_px = s * exit_s
+                pnl_points = exit_s - entry_s
+                pnl = pnl_points * _DOLLARS_PER_POINT * qty
+                # positional: side, qty, entry_ts, exit_ts, entry, exit, sl, tp, pnl_dollars
+                add_trade(Trade(_SIDE_NAME[in_pos], qty, ts[entry_i], ts[i], entry_px, exit_px, sl, tp, pnl))
+
+                day_pnl += pnl
+                if not first_trade_done:
+                    first_trade_done = True
+                    if pnl > 0 and (press_anywhere or press_sess[entry_i]):
+                        press_mode = True
+
+                if pnl < 0:
+                    losses_today += 1
+                    cooldown = max(cooldown, cooldown_len)
+                    if stop_after_first_loss:
+                        stop_for_day = True
+                    if losses_today >= max_losses:
+                        stop_for_day = True
+
+                if day_pnl <= loss_floor:
+                    stop_for_day = True
+
+                # daily target ladder
+                if day_pnl >= (target_press if press_mode else target_base):
+                    stop_for_day = True
+
+                in_pos = FLAT
+
+            if stop_for_day or cooldown > 0:
+                continue
+            if trades_today >= max_trades:
+                continue
+
+            j = i - 1
+            if not gate[j]:
+                continue
+
+            # track pullback cross of fast EMA (only on bars that reach this gate)
+            if crossed is not None and crossed[j]:
+                last_cross_i = j
+
+            go_long = long_sig[j]
+            go_short = short_sig[j]
+            if not (go_long or go_short):
+                if pull_gap is None:
+                    continue
+                gap = pull_gap[j]
+                if gap is None or (j - last_cross_i) < gap:
+                    continue
+                go_long = pull_long[j]
+                go_short = pull_short[j]
+                if not (go_long or go_short):
+                    continue
+
+            in_pos = LONG if go_long else SHORT
+            entry_i = i
+            entry_px = opens[i]
+
+            spec = exits[0] if exit_slot is None else exits[exit_slot[j]]
+            pos_ax = spec.ax
+            pos_trail_mult = spec.trail_atr_mult
+            pos_max_hold = spec.max_hold_bars
+
+            if pos_ax[j] is not None:
+                stop_dist = pos_ax[j] * spec.stop_atr_mult
+                qty = calc_qty(stop_dist, risk, max_micros)
+                tp_dist = pos_ax[j] * spec.tp_atr_mult if spec.tp_atr_mult is not None else stop_dist * 3.0
+
+                if in_pos == LONG:
+                    sl = entry_px - stop_dist
+                    tp = entry_px + tp_dist
+                else:
+                    sl = entry_px + stop_dist
+                    tp = entry_px - tp_dist
+                trail = sl
+
+                trades_today += 1
+            else:
+                # No exit ATR yet: the position still opens, keeping the previous
+                # trade's qty/stops, and isn't counted (long-standing behaviour).
+                trail = s * trail_s
+
+            s = float(in_pos)
+            fav_col = highs if in_pos == LONG else lows
+            adv_col = lows if in_pos == LONG else highs
+            entry_s = s * entry_px
+            sl_s = s * sl
+            tp_s = s * tp
+            trail_s = s * trail
+
+    return trades
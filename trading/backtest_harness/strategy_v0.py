@@ -21,10 +21,12 @@ This module produces a sequence of closed trades that can be fed into Lucid rule
 
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass
-from typing import List, Literal, Optional
+from typing import Any, Dict, List, Literal, Optional, Tuple
 
-from trading.backtest_harness.tv_csv import Candle
+from trading.backtest_harness.bar_time import minute_of_day, session_mask
+from trading.backtest_harness.tv_csv import Candle, CandleArrays
 
 Side = Literal["long", "short"]
 
@@ -55,6 +57,9 @@ class Trade:
 
 TICK = 0.25
 TICK_VALUE = 0.50  # $ per tick per MNQ
+# $ per point per MNQ, i.e. dollars_from_points as one multiplier for the bar loops.
+# TICK is a power of two, so x / TICK * TICK_VALUE == x * _DOLLARS_PER_POINT exactly.
+_DOLLARS_PER_POINT = TICK_VALUE / TICK
 
 
 def ema(series: List[float], length: int) -> List[Optional[float]]:
@@ -113,13 +118,23 @@ def true_range(high: float, low: float, prev_close: float) -> float:
 
 
 def atr(candles: List[Candle], length: int) -> List[Optional[float]]:
-    out: List[Optional[float]] = [None] * len(candles)
-    if length <= 0 or len(candles) < length + 1:
+    return atr_hlc(
+        [c.high for c in candles],
+        [c.low for c in candles],
+        [c.close for c in candles],
+        length,
+    )
+
+
+def atr_hlc(highs: List[float], lows: List[float], closes: List[float], length: int) -> List[Optional[float]]:
+    """ATR over high/low/close columns (Wilder smoothing, SMA seed)."""
+    out: List[Optional[float]] = [None] * len(closes)
+    if length <= 0 or len(closes) < length + 1:
         return out
 
     trs: List[float] = []
-    for i in range(1, len(candles)):
-        trs.append(true_range(candles[i].high, candles[i].low, candles[i - 1].close))
+    for i in range(1, len(closes)):
+        trs.append(true_range(highs[i], lows[i], closes[i - 1]))
 
     # first ATR is SMA of first `length` TRs
     if len(trs) < length:
@@ -127,7 +142,7 @@ def atr(candles: List[Candle], length: int) -> List[Optional[float]]:
     first = sum(trs[:length]) / length
     out[length] = first  # aligns with candle index length
     prev = first
-    for i in range(length + 1, len(candles)):
+    for i in range(length + 1, len(closes)):
         tr = trs[i - 1]
         prev = (prev * (length - 1) + tr) / length
         out[i] = prev
@@ -135,6 +150,150 @@ def atr(candles: List[Candle], length: int) -> List[Optional[float]]:
     return out
 
 
+def ema2_atr(
+    highs: List[float], lows: List[float], closes: List[float], fast: int, slow: int, atr_len: int
+) -> Tuple[List[Optional[float]], List[Optional[float]], List[Optional[float]]]:
+    """ema(closes, fast), ema(closes, slow) and atr_hlc(..., atr_len) in one pass over the bars.
+
+    Same arithmetic as the separate functions, so the results are bit-identical.
+    """
+    n = len(closes)
+    if min(fast, slow, atr_len) <= 0 or n < max(fast, slow, atr_len + 1):
+        return ema(closes, fast), ema(closes, slow), atr_hlc(highs, lows, closes, atr_len)
+
+    # warm each series up to a common bar m (all three causal), then advance them together
+    m = max(fast - 1, slow - 1, atr_len)
+    tail = [None] * (n - m - 1)
+    ef = ema(closes[: m + 1], fast) + tail
+    es = ema(closes[: m + 1], slow) + tail
+    a = atr_hlc(highs[: m + 1], lows[: m + 1], closes[: m + 1], atr_len) + tail
+
+    kf = 2.0 / (fast + 1.0)
+    ks = 2.0 / (slow + 1.0)
+    wilder = atr_len - 1
+    pf = ef[m]
+    ps = es[m]
+    pa = a[m]
+    pc = closes[m]
+    for i in range(m + 1, n):
+        c = closes[i]
+        h = highs[i]
+        lo = lows[i]
+        pf = (c - pf) * kf + pf
+        ef[i] = pf
+        ps = (c - ps) * ks + ps
+        es[i] = ps
+        # true_range, inlined (compares keep max()'s first-wins tie order)
+        tr = h - lo
+        d = h - pc if h >= pc else pc - h
+        if d > tr:
+            tr = d
+        d = lo - pc if lo >= pc else pc - lo
+        if d > tr:
+            tr = d
+        pa = (pa * wilder + tr) / atr_len
+        a[i] = pa
+        pc = c
+    return ef, es, a
+
+
+# Indicator memo for the most recent CandleArrays. A run often asks for the same
+# EMA/ATR length more than once (regime vs exit ATR, usually both 14: atr_cached then
+# hands back the regime ATR from ema2_atr_cached), and sweeps that pass the same
+# CandleArrays reuse them across params. The source is matched by identity and its
+# columns must not be mutated while cached; results are shared, so don't mutate them.
+_memo_src: Optional[CandleArrays] = None
+_memo: Dict[Tuple[Any, ...], List[Any]] = {}
+
+
+def _memo_for(cols: CandleArrays) -> Dict[Tuple[Any, ...], List[Any]]:
+    global _memo_src
+    if cols is not _memo_src:
+        _memo.clear()
+        _memo_src = cols
+    return _memo
+
+
+def ema_cached(cols: CandleArrays, length: int) -> List[Optional[float]]:
+    """ema(cols.close, length), memoized per CandleArrays."""
+    memo = _memo_for(cols)
+    out = memo.get(("ema", length))
+    if out is None:
+        out = memo[("ema", length)] = ema(cols.close, length)
+    return out
+
+
+def atr_cached(cols: CandleArrays, length: int) -> List[Optional[float]]:
+    """atr_hlc over cols, memoized per CandleArrays."""
+    memo = _memo_for(cols)
+    out = memo.get(("atr", length))
+    if out is None:
+        out = memo[("atr", length)] = atr_hlc(cols.high, cols.low, cols.close, length)
+    return out
+
+
+def ema2_atr_cached(
+    cols: CandleArrays, fast: int, slow: int, atr_len: int
+) -> Tuple[List[Optional[float]], List[Optional[float]], List[Optional[float]]]:
+    """ema2_atr over cols, sharing the ema_cached/atr_cached memo."""
+    memo = _memo_for(cols)
+    ef = memo.get(("ema", fast))
+    es = memo.get(("ema", slow))
+    a = memo.get(("atr", atr_len))
+    if ef is None or es is None or a is None:
+        ef, es, a = ema2_atr(cols.high, cols.low, cols.close, fast, slow, atr_len)
+        memo[("ema", fast)] = ef
+        memo[("ema", slow)] = es
+        memo[("atr", atr_len)] = a
+    return ef, es, a
+
+
+def session_mask_cached(cols: CandleArrays, start_min_utc: int, end_min_utc: int) -> List[bool]:
+    """session_mask over cols.ts, memoized per CandleArrays (minute of day computed once)."""
+    memo = _memo_for(cols)
+    out = memo.get(("session", start_min_utc, end_min_utc))
+    if out is None:
+        mod = memo.get(("minute_of_day",))
+        if mod is None:
+            mod = memo[("minute_of_day",)] = minute_of_day(cols.ts)
+        out = memo[("session", start_min_utc, end_min_utc)] = session_mask(mod, start_min_utc, end_min_utc)
+    return out
+
+
+def rolling_max(series: List[float], length: int) -> List[Optional[float]]:
+    """out[i] = max(series[i - length + 1 : i + 1]); monotonic deque, O(1) amortized per bar."""
+    out: List[Optional[float]] = [None] * len(series)
+    if length <= 0:
+        return out
+    q: deque = deque()  # indices, values decreasing
+    for i, x in enumerate(series):
+        while q and series[q[-1]] <= x:
+            q.pop()
+        q.append(i)
+        if q[0] <= i - length:
+            q.popleft()
+        if i >= length - 1:
+            out[i] = series[q[0]]
+    return out
+
+
+def rolling_min(series: List[float], length: int) -> List[Optional[float]]:
+    """out[i] = min(series[i - length + 1 : i + 1]); monotonic deque, O(1) amortized per bar."""
+    out: List[Optional[float]] = [None] * len(series)
+    if length <= 0:
+        return out
+    q: deque = deque()  # indices, values increasing
+    for i, x in enumerate(series):
+        while q and series[q[-1]] >= x:
+            q.pop()
+        q.append(i)
+        if q[0] <= i - length:
+            q.popleft()
+        if i >= length - 1:
+            out[i] = series[q[0]]
+    return out
+
+
 def dollars_from_points(points: float, qty_mnq: int = 1) -> float:
     # points -> ticks
     ticks = points / TICK
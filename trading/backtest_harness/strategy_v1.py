@@ -14,6 +14,7 @@ IMPORTANT: this is still a simplified fills model and uses UTC day boundaries.
 
 from __future__ import annotations
 
+import datetime
 from dataclasses import dataclass
 from typing import List, Literal, Optional, Tuple
 
@@ -66,8 +67,6 @@ class Trade:
 
 def minutes_utc(ts: int) -> int:
     # ts is unix seconds UTC
-    import datetime
-
     d = datetime.datetime.utcfromtimestamp(ts)
     return d.hour * 60 + d.minute
 
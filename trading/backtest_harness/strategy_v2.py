@@ -19,11 +19,13 @@ Note: This stays single-position and produces closed trades for eval simulation.
 
 from __future__ import annotations
 
+import datetime
 from dataclasses import dataclass
 from typing import List, Literal, Optional, Sequence
 
 from trading.backtest_harness.tv_csv import Candle
-from trading.backtest_harness.strategy_v0 import ema, rsi, atr, dollars_from_points, TICK, TICK_VALUE
+from trading.backtest_harness.bar_time import SECONDS_PER_DAY, minute_of_day
+from trading.backtest_harness.strategy_v0 import ema2_atr, rsi, rolling_max, rolling_min, dollars_from_points, TICK, TICK_VALUE
 
 Side = Literal["long", "short"]
 
@@ -147,15 +149,11 @@ class Trade:
 
 
 def minutes_utc(ts: int) -> int:
-    import datetime
-
     d = datetime.datetime.utcfromtimestamp(ts)
     return d.hour * 60 + d.minute
 
 
 def day_key_utc(ts: int) -> str:
-    import datetime
-
     return datetime.datetime.utcfromtimestamp(ts).strftime("%Y-%m-%d")
 
 
@@ -187,11 +185,17 @@ def generate_trades(candles: List[Candle], p: Params) -> List[Trade]:
     opens = [c.open for c in candles]
     highs = [c.high for c in candles]
     lows = [c.low for c in candles]
+    ts = [c.ts for c in candles]
+    # integer UTC minute of day per bar (no datetime in the loop)
+    mod = minute_of_day(ts)
 
-    ef = ema(closes, p.ema_fast)
-    es = ema(closes, p.ema_slow)
+    ef, es, a = ema2_atr(highs, lows, closes, p.ema_fast, p.ema_slow, p.atr_len)
     r = rsi(closes, p.rsi_len)
-    a = atr(candles, p.atr_len)
+
+    # breakout range over the lookback window ending at bar k
+    if p.breakout.enabled:
+        rng_high = rolling_max(highs, p.breakout.lookback)
+        rng_low = rolling_min(lows, p.breakout.lookback)
 
     trades: List[Trade] = []
 
@@ -220,7 +224,7 @@ def generate_trades(candles: List[Candle], p: Params) -> List[Trade]:
     orb_done = False
 
     for i in range(1, len(candles)):
-        d = day_key_utc(candles[i].ts)
+        d = ts[i] // SECONDS_PER_DAY
         if cur_day != d:
             cur_day = d
             trades_today = 0
@@ -326,7 +330,7 @@ def generate_trades(candles: List[Candle], p: Params) -> List[Trade]:
         if in_pos is None:
             # Update ORB range using the signal bar (j=i-1) so it's ready before entries.
             j = i - 1
-            m = minutes_utc(candles[j].ts)
+            m = mod[j]
             if p.orb.enabled:
                 start = p.orb.session_start_min_utc
                 end = start + p.orb.range_minutes
@@ -350,7 +354,7 @@ def generate_trades(candles: List[Candle], p: Params) -> List[Trade]:
 
             # filters on signal bar
             if p.session.enabled:
-                m2 = minutes_utc(candles[j].ts)
+                m2 = mod[j]
                 if p.session.start_min_utc <= p.session.end_min_utc:
                     if not (p.session.start_min_utc <= m2 <= p.session.end_min_utc):
                         continue
@@ -382,8 +386,8 @@ def generate_trades(candles: List[Candle], p: Params) -> List[Trade]:
                 lb = p.breakout.lookback
                 if j - lb < 1:
                     continue
-                prev_high = max(highs[j - lb : j])
-                prev_low = min(lows[j - lb : j])
+                prev_high = rng_high[j - 1]
+                prev_low = rng_low[j - 1]
                 rng = highs[j] - lows[j]
                 if rng < a[j] * p.breakout.range_atr_mult:
                     continue
@@ -29,11 +29,13 @@ Returns closed trades.
 
 from __future__ import annotations
 
+import datetime
 from dataclasses import dataclass
 from typing import List, Literal, Optional
 
 from trading.backtest_harness.tv_csv import Candle
-from trading.backtest_harness.strategy_v0 import atr, dollars_from_points, TICK, TICK_VALUE
+from trading.backtest_harness.bar_time import SECONDS_PER_DAY, minute_of_day, session_mask
+from trading.backtest_harness.strategy_v0 import atr, rolling_max, rolling_min, dollars_from_points, TICK, TICK_VALUE
 
 Side = Literal["long", "short"]
 
@@ -81,15 +83,11 @@ class Trade:
 
 
 def minutes_utc(ts: int) -> int:
-    import datetime
-
     d = datetime.datetime.utcfromtimestamp(ts)
     return d.hour * 60 + d.minute
 
 
 def day_key_utc(ts: int) -> str:
-    import datetime
-
     return datetime.datetime.utcfromtimestamp(ts).strftime("%Y-%m-%d")
 
 
@@ -118,6 +116,16 @@ def generate_trades(candles: List[Candle], p: Params) -> List[Trade]:
 
     a = atr(candles, p.atr_len)
 
+    # session flag per bar (integer minute of day, no datetime in the loop)
+    if p.session.enabled:
+        in_sess = session_mask(minute_of_day([c.ts for c in candles]), p.session.start_min_utc, p.session.end_min_utc)
+    else:
+        in_sess = [True] * len(candles)
+
+    # Donchian channel over the window ending at bar k
+    chan_high = rolling_max(highs, p.donchian_len)
+    chan_low = rolling_min(lows, p.donchian_len)
+
     trades: List[Trade] = []
 
     in_pos: Optional[Side] = None
@@ -135,7 +143,7 @@ def generate_trades(candles: List[Candle], p: Params) -> List[Trade]:
     stop_for_day = False
 
     for i in range(1, len(candles)):
-        d = day_key_utc(candles[i].ts)
+        d = candles[i].ts // SECONDS_PER_DAY
         if cur_day != d:
             cur_day = d
             trades_today = 0
@@ -201,13 +209,13 @@ def generate_trades(candles: List[Candle], p: Params) -> List[Trade]:
             j = i - 1
             if a[j] is None:
                 continue
-            if not in_session(candles[j].ts, p.session):
+            if not in_sess[j]:
                 continue
             if j - p.donchian_len < 1:
                 continue
 
-            upper = max(highs[j - p.donchian_len : j])
-            lower = min(lows[j - p.donchian_len : j])
+            upper = chan_high[j - 1]
+            lower = chan_low[j - 1]
 
             long_sig = closes[j] > upper
             short_sig = closes[j] < lower
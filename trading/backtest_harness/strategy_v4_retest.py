@@ -25,11 +25,13 @@ This is experimental and intended to change the edge vs v2.
 
 from __future__ import annotations
 
+import datetime
 from dataclasses import dataclass
 from typing import List, Literal, Optional, Tuple
 
 from trading.backtest_harness.tv_csv_multi import Candle
-from trading.backtest_harness.strategy_v0 import ema, atr, dollars_from_points, TICK, TICK_VALUE
+from trading.backtest_harness.bar_time import day_spans, minute_of_day, session_mask
+from trading.backtest_harness.strategy_v0 import ema2_atr, atr, rolling_max, rolling_min, _DOLLARS_PER_POINT, TICK, TICK_VALUE
 
 Side = Literal["long", "short"]
 
@@ -100,8 +102,6 @@ class Trade:
 
 
 def minutes_utc(ts: int) -> int:
-    import datetime
-
     d = datetime.datetime.utcfromtimestamp(ts)
     return d.hour * 60 + d.minute
 
@@ -116,8 +116,6 @@ def in_session(ts: int, s: Session) -> bool:
 
 
 def day_key_utc(ts: int) -> str:
-    import datetime
-
     return datetime.datetime.utcfromtimestamp(ts).strftime("%Y-%m-%d")
 
 
@@ -142,15 +140,30 @@ def align_regime(c1: List[Candle], c15: List[Candle]) -> List[int]:
 
 
 def generate_trades(c1: List[Candle], c15: List[Candle], p: Params) -> List[Trade]:
+    highs15 = [c.high for c in c15]
+    lows15 = [c.low for c in c15]
     closes15 = [c.close for c in c15]
-    ef15 = ema(closes15, p.regime.ema_fast)
-    es15 = ema(closes15, p.regime.ema_slow)
-    atr15 = atr(c15, p.regime.atr_len)
+    ef15, es15, atr15 = ema2_atr(highs15, lows15, closes15, p.regime.ema_fast, p.regime.ema_slow, p.regime.atr_len)
 
     atr1 = atr(c1, p.exits.atr_len)
 
     map15 = align_regime(c1, c15)
 
+    # breakout level range over the lookback window ending at bar k
+    L = p.entry.level_lookback
+    rng_highs = rolling_max([c.high for c in c1], L)
+    rng_lows = rolling_min([c.low for c in c1], L)
+
+    # Resolve optional params once so the bar loop doesn't re-test them:
+    # a disabled governor limit becomes a bound that can never trip.
+    gov = p.governor
+    max_trades = gov.max_trades_per_day if gov.max_trades_per_day is not None else float("inf")
+    max_losses = gov.max_losses_per_day if gov.max_losses_per_day is not None else float("inf")
+    loss_floor = -abs(gov.daily_loss_stop) if gov.daily_loss_stop is not None else float("-inf")
+    be_mult = p.exits.be_atr_mult
+    use_be = be_mult is not None
+    use_session = p.session.enabled
+
     trades: List[Trade] = []
 
     in_pos: Optional[Side] = None
@@ -161,181 +174,170 @@ def generate_trades(c1: List[Candle], c15: List[Candle], p: Params) -> List[Trad
     tp = 0.0
     be_moved = False
 
-    # governor state per day
-    cur_day = None
-    trades_today = 0
-    losses_today = 0
-    day_pnl = 0.0
-    cooldown = 0
-    stop_for_day = False
-
-    # state machine for setup
-    state = "idle"  # idle | breakout_long | breakout_short
-    level = None
-    deadline_i = None
-
-    for i in range(2, len(c1)):
-        d = day_key_utc(c1[i].ts)
-        if cur_day != d:
-            cur_day = d
-            trades_today = 0
-            losses_today = 0
-            day_pnl = 0.0
-            cooldown = 0
-            stop_for_day = False
-            state = "idle"
-            level = None
-            deadline_i = None
-
-        if cooldown > 0:
-            cooldown -= 1
-
-        # manage open position
-        if in_pos is not None:
-            hi = c1[i].high
-            lo = c1[i].low
-
-            # move SL to BE once price moves in favor by threshold
-            if (not be_moved) and p.exits.be_atr_mult is not None and atr1[i] is not None:
-                thr = float(atr1[i]) * p.exits.be_atr_mult
-                if in_pos == "long" and hi >= entry_px + thr:
-                    sl = max(sl, entry_px)
-                    be_moved = True
-                if in_pos == "short" and lo <= entry_px - thr:
-                    sl = min(sl, entry_px)
-                    be_moved = True
-
-            hit_sl = (lo <= sl) if in_pos == "long" else (hi >= sl)
-            hit_tp = (hi >= tp) if in_pos == "long" else (lo <= tp)
-
-            exit_px = None
-            if hit_sl and hit_tp:
-                exit_px = sl
-            elif hit_sl:
-                exit_px = sl
-            elif hit_tp:
-                exit_px = tp
-
-            # time stop
-            if exit_px is None and (i - entry_i) >= p.exits.max_hold_bars:
-                exit_px = c1[i].close
-
-            if exit_px is not None:
-                pnl_points = (exit_px - entry_px) if in_pos == "long" else (entry_px - exit_px)
-                pnl = dollars_from_points(pnl_points, qty_mnq=qty)
-                trades.append(
-                    Trade(
-                        side=in_pos,
-                        qty=qty,
-                        entry_ts=c1[entry_i].ts,
-                        exit_ts=c1[i].ts,
-                        entry=entry_px,
-                        exit=exit_px,
-                        sl=sl,
-                        tp=tp,
-                        pnl_dollars=pnl,
+    ts = [c.ts for c in c1]
+    in_sess = session_mask(minute_of_day(ts), p.session.start_min_utc, p.session.end_min_utc) if use_session else None
+    for day_begin, day_end in day_spans(ts, 2):
+        # governor state per day
+        trades_today = 0
+        losses_today = 0
+        day_pnl = 0.0
+        cooldown = 0
+        stop_for_day = False
+
+        # state machine for setup
+        state = "idle"  # idle | breakout_long | breakout_short
+        level = None
+        deadline_i = None
+
+        for i in range(day_begin, day_end):
+            if cooldown > 0:
+                cooldown -= 1
+
+            # manage open position
+            if in_pos is not None:
+                hi = c1[i].high
+                lo = c1[i].low
+
+                # move SL to BE once price moves in favor by threshold
+                if use_be and (not be_moved) and atr1[i] is not None:
+                    thr = float(atr1[i]) * be_mult
+                    if in_pos == "long" and hi >= entry_px + thr:
+                        sl = max(sl, entry_px)
+                        be_moved = True
+                    if in_pos == "short" and lo <= entry_px - thr:
+                        sl = min(sl, entry_px)
+                        be_moved = True
+
+                hit_sl = (lo <= sl) if in_pos == "long" else (hi >= sl)
+                hit_tp = (hi >= tp) if in_pos == "long" else (lo <= tp)
+
+                exit_px = None
+                if hit_sl and hit_tp:
+                    exit_px = sl
+                elif hit_sl:
+                    exit_px = sl
+                elif hit_tp:
+                    exit_px = tp
+
+                # time stop
+                if exit_px is None and (i - entry_i) >= p.exits.max_hold_bars:
+                    exit_px = c1[i].close
+
+                if exit_px is not None:
+                    pnl_points = (exit_px - entry_px) if in_pos == "long" else (entry_px - exit_px)
+                    pnl = pnl_points * _DOLLARS_PER_POINT * qty
+                    trades.append(
+                        Trade(
+                            side=in_pos,
+                            qty=qty,
+                            entry_ts=c1[entry_i].ts,
+                            exit_ts=c1[i].ts,
+                            entry=entry_px,
+                            exit=exit_px,
+                            sl=sl,
+                            tp=tp,
+                            pnl_dollars=pnl,
+                        )
                     )
-                )
 
-                day_pnl += pnl
-                if pnl < 0:
-                    losses_today += 1
-                    cooldown = max(cooldown, p.governor.cooldown_bars_after_loss)
-                    if p.governor.max_losses_per_day is not None and losses_today >= p.governor.max_losses_per_day:
+                    day_pnl += pnl
+                    if pnl < 0:
+                        losses_today += 1
+                        cooldown = max(cooldown, p.governor.cooldown_bars_after_loss)
+                        if losses_today >= max_losses:
+                            stop_for_day = True
+                    if day_pnl <= loss_floor:
                         stop_for_day = True
-                if p.governor.daily_loss_stop is not None and day_pnl <= -abs(p.governor.daily_loss_stop):
-                    stop_for_day = True
-
-                in_pos = None
-                be_moved = False
-
-        if in_pos is not None:
-            continue
-
-        # flat: maybe stop
-        if stop_for_day or cooldown > 0:
-            continue
-        if p.governor.max_trades_per_day is not None and trades_today >= p.governor.max_trades_per_day:
-            continue
-
-        # session
-        if not in_session(c1[i - 1].ts, p.session):
-            continue
-
-        # regime filter using mapped 15m bar
-        j15 = map15[i - 1]
-        if ef15[j15] is None or es15[j15] is None or atr15[j15] is None:
-            continue
-        if float(atr15[j15]) < p.regime.atr_min_points:
-            continue
-        spread = abs(float(ef15[j15]) - float(es15[j15]))
-        if spread < p.regime.min_spread_points:
-            continue
-
-        trend_up = float(ef15[j15]) > float(es15[j15])
-        trend_dn = float(ef15[j15]) < float(es15[j15])
-
-        # compute breakout level from 1m history
-        L = p.entry.level_lookback
-        j = i - 1
-        if j - L < 2:
-            continue
-        prev_high = max(x.high for x in c1[j - L : j])
-        prev_low = min(x.low for x in c1[j - L : j])
-
-        # state transitions
-        close_j = c1[j].close
-        eps = p.entry.retest_epsilon_points
-
-        if state == "idle":
-            if trend_up and close_j > prev_high:
-                state = "breakout_long"
-                level = prev_high
-                deadline_i = j + p.entry.retest_deadline_bars
-            elif trend_dn and close_j < prev_low:
-                state = "breakout_short"
-                level = prev_low
-                deadline_i = j + p.entry.retest_deadline_bars
-
-        if state == "breakout_long":
-            if deadline_i is not None and j > deadline_i:
-                state = "idle"
-            else:
-                # retest touch
-                if c1[j].low <= float(level) + eps:
-                    # confirmation close back above level
-                    if close_j > float(level):
-                        # enter long next bar open
-                        if atr1[j] is None:
-                            state = "idle"
-                        else:
-                            entry_i = i
-                            entry_px = c1[i].open
-                            stop_dist = float(atr1[j]) * p.exits.atr_mult_stop
-                            qty = calc_qty_from_stop(stop_dist, p.risk_per_trade_dollars, p.max_micros)
-                            sl = entry_px - stop_dist
-                            tp = entry_px + float(atr1[j]) * p.exits.tp_atr_mult
-                            in_pos = "long"
-                            trades_today += 1
-                            state = "idle"
-
-        if state == "breakout_short":
-            if deadline_i is not None and j > deadline_i:
-                state = "idle"
-            else:
-                if c1[j].high >= float(level) - eps:
-                    if close_j < float(level):
-                        if atr1[j] is None:
-                            state = "idle"
-                        else:
-                            entry_i = i
-                            entry_px = c1[i].open
-                            stop_dist = float(atr1[j]) * p.exits.atr_mult_stop
-                            qty = calc_qty_from_stop(stop_dist, p.risk_per_trade_dollars, p.max_micros)
-                            sl = entry_px + stop_dist
-                            tp = entry_px - float(atr1[j]) * p.exits.tp_atr_mult
-                            in_pos = "short"
-                            trades_today += 1
-                            state = "idle"
+
+                    in_pos = None
+                    be_moved = False
+
+            if in_pos is not None:
+                continue
+
+            # flat: maybe stop
+            if stop_for_day or cooldown > 0:
+                continue
+            if trades_today >= max_trades:
+                continue
+
+            # session
+            if use_session and not in_sess[i - 1]:
+                continue
+
+            # regime filter using mapped 15m bar
+            j15 = map15[i - 1]
+            if ef15[j15] is None or es15[j15] is None or atr15[j15] is None:
+                continue
+            if float(atr15[j15]) < p.regime.atr_min_points:
+                continue
+            spread = abs(float(ef15[j15]) - float(es15[j15]))
+            if spread < p.regime.min_spread_points:
+                continue
+
+            trend_up = float(ef15[j15]) > float(es15[j15])
+            trend_dn = float(ef15[j15]) < float(es15[j15])
+
+            # compute breakout level from 1m history
+            j = i - 1
+            if j - L < 2:
+                continue
+            prev_high = rng_highs[j - 1]
+            prev_low = rng_lows[j - 1]
+
+            # state transitions
+            close_j = c1[j].close
+            eps = p.entry.retest_epsilon_points
+
+            if state == "idle":
+                if trend_up and close_j > prev_high:
+                    state = "breakout_long"
+                    level = prev_high
+                    deadline_i = j + p.entry.retest_deadline_bars
+                elif trend_dn and close_j < prev_low:
+                    state = "breakout_short"
+                    level = prev_low
+                    deadline_i = j + p.entry.retest_deadline_bars
+
+            if state == "breakout_long":
+                if deadline_i is not None and j > deadline_i:
+                    state = "idle"
+                else:
+                    # retest touch
+                    if c1[j].low <= float(level) + eps:
+                        # confirmation close back above level
+                        if close_j > float(level):
+                            # enter long next bar open
+                            if atr1[j] is None:
+                                state = "idle"
+                            else:
+                                entry_i = i
+                                entry_px = c1[i].open
+                                stop_dist = float(atr1[j]) * p.exits.atr_mult_stop
+                                qty = calc_qty_from_stop(stop_dist, p.risk_per_trade_dollars, p.max_micros)
+                                sl = entry_px - stop_dist
+                                tp = entry_px + float(atr1[j]) * p.exits.tp_atr_mult
+                                in_pos = "long"
+                                trades_today += 1
+                                state = "idle"
+
+            if state == "breakout_short":
+                if deadline_i is not None and j > deadline_i:
+                    state = "idle"
+                else:
+                    if c1[j].high >= float(level) - eps:
+                        if close_j < float(level):
+                            if atr1[j] is None:
+                                state = "idle"
+                            else:
+                                entry_i = i
+                                entry_px = c1[i].open
+                                stop_dist = float(atr1[j]) * p.exits.atr_mult_stop
+                                qty = calc_qty_from_stop(stop_dist, p.risk_per_trade_dollars, p.max_micros)
+                                sl = entry_px + stop_dist
+                                tp = entry_px - float(atr1[j]) * p.exits.tp_atr_mult
+                                in_pos = "short"
+                                trades_today += 1
+                                state = "idle"
 
     return trades
@@ -13,11 +13,13 @@ Note: This is a research harness, not production fills.
 
 from __future__ import annotations
 
+import datetime
 from dataclasses import dataclass
-from typing import List, Literal, Optional, Sequence
+from typing import List, Literal, Optional, Sequence, Union
 
-from trading.backtest_harness.tv_csv import Candle
-from trading.backtest_harness.strategy_v0 import ema, atr, dollars_from_points, TICK, TICK_VALUE
+from trading.backtest_harness.tv_csv import Candle, CandleArrays
+from trading.backtest_harness.bar_time import day_spans
+from trading.backtest_harness.strategy_v0 import ema2_atr, atr_hlc, rolling_max, rolling_min, _DOLLARS_PER_POINT, TICK, TICK_VALUE
 
 Side = Literal["long", "short"]
 
@@ -29,8 +31,6 @@ class Window:
 
 
 def minutes_utc(ts: int) -> int:
-    import datetime
-
     d = datetime.datetime.utcfromtimestamp(ts)
     return d.hour * 60 + d.minute
 
@@ -50,8 +50,6 @@ def in_windows(ts: int, windows: Sequence[Window]) -> bool:
 
 
 def day_key_utc(ts: int) -> str:
-    import datetime
-
     return datetime.datetime.utcfromtimestamp(ts).strftime("%Y-%m-%d")
 
 
@@ -132,17 +130,29 @@ def calc_qty_from_stop(stop_dist_points: float, risk_per_trade_dollars: float, m
     return qty
 
 
-def generate_trades(candles: List[Candle], p: Params) -> List[Trade]:
-    highs = [c.high for c in candles]
-    lows = [c.low for c in candles]
-    closes = [c.close for c in candles]
-    opens = [c.open for c in candles]
+def generate_trades(candles: Union[List[Candle], CandleArrays], p: Params) -> List[Trade]:
+    if isinstance(candles, CandleArrays):
+        ts, opens, highs, lows, closes = candles.ts, candles.open, candles.high, candles.low, candles.close
+    else:
+        ts = [c.ts for c in candles]
+        highs = [c.high for c in candles]
+        lows = [c.low for c in candles]
+        closes = [c.close for c in candles]
+        opens = [c.open for c in candles]
 
-    ef = ema(closes, p.regime.ema_fast)
-    es = ema(closes, p.regime.ema_slow)
-    a = atr(candles, p.regime.atr_len)
+    ef, es, a = ema2_atr(highs, lows, closes, p.regime.ema_fast, p.regime.ema_slow, p.regime.atr_len)
+    # exit ATR usually shares the regime length (14); alias instead of recomputing
+    ax = a if p.exits.atr_len == p.regime.atr_len else atr_hlc(highs, lows, closes, p.exits.atr_len)
 
-    ax = atr(candles, p.exits.atr_len)
+    # entry range over the lookback window ending at bar k
+    rng_highs = rolling_max(highs, p.entry.lookback)
+    rng_lows = rolling_min(lows, p.entry.lookback)
+
+    # Resolve flag/optional params once so the bar loop doesn't re-test them.
+    use_retest = p.entry.use_retest
+    sizeup_spread = p.regime.sizeup_spread_points if p.regime.sizeup_enabled else float("inf")
+    tp_mult = p.exits.tp_atr_mult
+    tp_from_atr = tp_mult is not None
 
     trades: List[Trade] = []
 
@@ -154,183 +164,174 @@ def generate_trades(candles: List[Candle], p: Params) -> List[Trade]:
     tp = 0.0
     trail = 0.0
 
-    cur_day = None
-    trades_today = 0
-    losses_today = 0
-    day_pnl = 0.0
-    cooldown = 0
-    stop_for_day = False
-
-    state = "idle"
     level = 0.0
     deadline = 0
 
-    for i in range(2, len(candles)):
-        d = day_key_utc(candles[i].ts)
-        if d != cur_day:
-            cur_day = d
-            trades_today = 0
-            losses_today = 0
-            day_pnl = 0.0
-            cooldown = 0
-            stop_for_day = False
-            state = "idle"
-
-        if cooldown > 0:
-            cooldown -= 1
-
-        # manage open
-        if in_pos is not None:
-            hi = highs[i]
-            lo = lows[i]
-
-            if ax[i] is not None:
-                tr = float(ax[i]) * p.exits.trail_atr_mult
-                if in_pos == "long":
-                    trail = max(trail, hi - tr)
-                    sl_eff = max(sl, trail)
+    for day_begin, day_end in day_spans(ts, 2):
+        # governor + retest state per day
+        trades_today = 0
+        losses_today = 0
+        day_pnl = 0.0
+        cooldown = 0
+        stop_for_day = False
+        state = "idle"
+
+        for i in range(day_begin, day_end):
+            if cooldown > 0:
+                cooldown -= 1
+
+            # manage open
+            if in_pos is not None:
+                hi = highs[i]
+                lo = lows[i]
+
+                if ax[i] is not None:
+                    tr = float(ax[i]) * p.exits.trail_atr_mult
+                    if in_pos == "long":
+                        trail = max(trail, hi - tr)
+                        sl_eff = max(sl, trail)
+                    else:
+                        trail = min(trail, lo + tr)
+                        sl_eff = min(sl, trail)
                 else:
-                    trail = min(trail, lo + tr)
-                    sl_eff = min(sl, trail)
-            else:
-                sl_eff = sl
-
-            hit_sl = (lo <= sl_eff) if in_pos == "long" else (hi >= sl_eff)
-            hit_tp = (hi >= tp) if in_pos == "long" else (lo <= tp)
-
-            exit_px = None
-            if hit_sl and hit_tp:
-                exit_px = sl_eff
-            elif hit_sl:
-                exit_px = sl_eff
-            elif hit_tp:
-                exit_px = tp
-
-            if exit_px is None and (i - entry_i) >= p.exits.max_hold_bars:
-                exit_px = closes[i]
-
-            if exit_px is not None:
-                pnl_points = (exit_px - entry_px) if in_pos == "long" else (entry_px - exit_px)
-                pnl = dollars_from_points(pnl_points, qty_mnq=qty)
-                trades.append(
-                    Trade(
-                        side=in_pos,
-                        qty=qty,
-                        entry_ts=candles[entry_i].ts,
-                        exit_ts=candles[i].ts,
-                        entry=entry_px,
-                        exit=exit_px,
-                        sl=sl,
-                        tp=tp,
-                        pnl_dollars=pnl,
+                    sl_eff = sl
+
+                hit_sl = (lo <= sl_eff) if in_pos == "long" else (hi >= sl_eff)
+                hit_tp = (hi >= tp) if in_pos == "long" else (lo <= tp)
+
+                exit_px = None
+                if hit_sl and hit_tp:
+                    exit_px = sl_eff
+                elif hit_sl:
+                    exit_px = sl_eff
+                elif hit_tp:
+                    exit_px = tp
+
+                if exit_px is None and (i - entry_i) >= p.exits.max_hold_bars:
+                    exit_px = closes[i]
+
+                if exit_px is not None:
+                    pnl_points = (exit_px - entry_px) if in_pos == "long" else (entry_px - exit_px)
+                    pnl = pnl_points * _DOLLARS_PER_POINT * qty
+                    trades.append(
+                        Trade(
+                            side=in_pos,
+                            qty=qty,
+                            entry_ts=ts[entry_i],
+                            exit_ts=ts[i],
+                            entry=entry_px,
+                            exit=exit_px,
+                            sl=sl,
+                            tp=tp,
+                            pnl_dollars=pnl,
+                        )
                     )
-                )
 
-                day_pnl += pnl
-                if pnl < 0:
-                    losses_today += 1
-                    cooldown = max(cooldown, p.governor.cooldown_bars_after_loss)
-                    if losses_today >= p.governor.max_losses_per_day:
-                        stop_for_day = True
+                    day_pnl += pnl
+                    if pnl < 0:
+                        losses_today += 1
+                        cooldown = max(cooldown, p.governor.cooldown_bars_after_loss)
+                        if losses_today >= p.governor.max_losses_per_day:
+                            stop_for_day = True
 
-                if day_pnl <= -abs(p.governor.daily_loss_stop):
-                    stop_for_day = True
+                    if day_pnl <= -abs(p.governor.daily_loss_stop):
+                        stop_for_day = True
 
-                in_pos = None
+                    in_pos = None
 
-        if in_pos is not None:
-            continue
+            if in_pos is not None:
+                continue
 
-        if stop_for_day or cooldown > 0:
-            continue
-        if trades_today >= p.governor.max_trades_per_day:
-            continue
+            if stop_for_day or cooldown > 0:
+                continue
+            if trades_today >= p.governor.max_trades_per_day:
+                continue
 
-        j = i - 1
-        if not in_windows(candles[j].ts, p.windows):
-            continue
+            j = i - 1
+            if not in_windows(ts[j], p.windows):
+                continue
 
-        if ef[j] is None or es[j] is None or a[j] is None or ax[j] is None:
-            continue
-        if float(a[j]) < p.regime.atr_min_points:
-            continue
+            if ef[j] is None or es[j] is None or a[j] is None or ax[j] is None:
+                continue
+            if float(a[j]) < p.regime.atr_min_points:
+                continue
 
-        spread = abs(float(ef[j]) - float(es[j]))
-        if spread < p.regime.min_spread_points:
-            continue
+            spread = abs(float(ef[j]) - float(es[j]))
+            if spread < p.regime.min_spread_points:
+                continue
 
-        trend_up = float(ef[j]) > float(es[j])
-        trend_dn = float(ef[j]) < float(es[j])
+            trend_up = float(ef[j]) > float(es[j])
+            trend_dn = float(ef[j]) < float(es[j])
 
-        lb = p.entry.lookback
-        if j - lb < 1:
-            continue
-        rng_high = max(highs[j - lb : j])
-        rng_low = min(lows[j - lb : j])
-        eps = p.entry.retest_epsilon_points
+            lb = p.entry.lookback
+            if j - lb < 1:
+                continue
+            rng_high = rng_highs[j - 1]
+            rng_low = rng_lows[j - 1]
+            eps = p.entry.retest_epsilon_points
 
-        long_sig = False
-        short_sig = False
+            long_sig = False
+            short_sig = False
 
-        if not p.entry.use_retest:
-            long_sig = trend_up and closes[j] > rng_high
-            short_sig = trend_dn and closes[j] < rng_low
-        else:
-            if state == "idle":
-                if trend_up and closes[j] > rng_high:
-                    state = "wait_retest_long"
-                    level = rng_high
-                    deadline = j + p.entry.retest_deadline_bars
-                elif trend_dn and closes[j] < rng_low:
-                    state = "wait_retest_short"
-                    level = rng_low
-                    deadline = j + p.entry.retest_deadline_bars
-
-            if state == "wait_retest_long":
-                if j > deadline:
-                    state = "idle"
-                else:
-                    if (lows[j] <= level + eps) and (closes[j] > level):
-                        long_sig = True
+            if not use_retest:
+                long_sig = trend_up and closes[j] > rng_high
+                short_sig = trend_dn and closes[j] < rng_low
+            else:
+                if state == "idle":
+                    if trend_up and closes[j] > rng_high:
+                        state = "wait_retest_long"
+                        level = rng_high
+                        deadline = j + p.entry.retest_deadline_bars
+                    elif trend_dn and closes[j] < rng_low:
+                        state = "wait_retest_short"
+                        level = rng_low
+                        deadline = j + p.entry.retest_deadline_bars
+
+                if state == "wait_retest_long":
+                    if j > deadline:
                         state = "idle"
-            elif state == "wait_retest_short":
-                if j > deadline:
-                    state = "idle"
-                else:
-                    if (highs[j] >= level - eps) and (closes[j] < level):
-                        short_sig = True
+                    else:
+                        if (lows[j] <= level + eps) and (closes[j] > level):
+                            long_sig = True
+                            state = "idle"
+                elif state == "wait_retest_short":
+                    if j > deadline:
                         state = "idle"
+                    else:
+                        if (highs[j] >= level - eps) and (closes[j] < level):
+                            short_sig = True
+                            state = "idle"
 
-        if not (long_sig or short_sig):
-            continue
+            if not (long_sig or short_sig):
+                continue
 
-        in_pos = "long" if long_sig else "short"
-        entry_i = i
-        entry_px = opens[i]
+            in_pos = "long" if long_sig else "short"
+            entry_i = i
+            entry_px = opens[i]
 
-        stop_dist = float(ax[j]) * p.exits.stop_atr_mult
+            stop_dist = float(ax[j]) * p.exits.stop_atr_mult
 
-        risk = p.risk_per_trade_dollars
-        if p.regime.sizeup_enabled and spread >= p.regime.sizeup_spread_points:
-            risk = risk * p.regime.sizeup_mult
+            risk = p.risk_per_trade_dollars
+            if spread >= sizeup_spread:
+                risk = risk * p.regime.sizeup_mult
 
-        qty = calc_qty_from_stop(stop_dist, float(risk), p.max_micros)
+            qty = calc_qty_from_stop(stop_dist, float(risk), p.max_micros)
 
-        if in_pos == "long":
-            sl = entry_px - stop_dist
-            trail = sl
-            if p.exits.tp_atr_mult is None:
-                tp = entry_px + stop_dist * 3.0
-            else:
-                tp = entry_px + float(ax[j]) * p.exits.tp_atr_mult
-        else:
-            sl = entry_px + stop_dist
-            trail = sl
-            if p.exits.tp_atr_mult is None:
-                tp = entry_px - stop_dist * 3.0
+            if in_pos == "long":
+                sl = entry_px - stop_dist
+                trail = sl
+                if tp_from_atr:
+                    tp = entry_px + float(ax[j]) * tp_mult
+                else:
+                    tp = entry_px + stop_dist * 3.0
             else:
-                tp = entry_px - float(ax[j]) * p.exits.tp_atr_mult
+                sl = entry_px + stop_dist
+                trail = sl
+                if tp_from_atr:
+                    tp = entry_px - float(ax[j]) * tp_mult
+                else:
+                    tp = entry_px - stop_dist * 3.0
 
-        trades_today += 1
+            trades_today += 1
 
     return trades
@@ -17,33 +17,24 @@ This is research-only; no partials.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Literal, Optional
-
-from trading.backtest_harness.tv_csv import Candle
-from trading.backtest_harness.strategy_v0 import ema, atr, dollars_from_points, TICK, TICK_VALUE
-
-Side = Literal["long", "short"]
-
-
-def minutes_utc(ts: int) -> int:
-    import datetime
-
-    d = datetime.datetime.utcfromtimestamp(ts)
-    return d.hour * 60 + d.minute
-
-
-def in_session(ts: int, start_min_utc: int, end_min_utc: int) -> bool:
-    m = minutes_utc(ts)
-    if start_min_utc <= end_min_utc:
-        return start_min_utc <= m <= end_min_utc
-    return m >= start_min_utc or m <= end_min_utc
-
-
-def day_key_utc(ts: int) -> str:
-    import datetime
-
-    return datetime.datetime.utcfromtimestamp(ts).strftime("%Y-%m-%d")
+from dataclasses import dataclass, replace
+from typing import List, Optional, Tuple, Union
+
+from trading.backtest_harness.tv_csv import Candle, CandleArrays, candles_to_arrays
+from trading.backtest_harness.strategy_v0 import ema2_atr_cached, atr_cached, rolling_max, rolling_min, session_mask_cached
+from trading.backtest_harness.strategy_common import (
+    _DOLLARS_PER_POINT,
+    DayRules,
+    ExitSpec,
+    Side,
+    SignalsMemo,
+    Trade,
+    calc_qty,
+    day_key_utc,
+    in_session,
+    minutes_utc,
+    run_bars,
+)
 
 
 @dataclass(frozen=True)
@@ -114,222 +105,142 @@ class Params:
 
 
 @dataclass(frozen=True)
-class Trade:
-    side: Side
-    qty: int
-    entry_ts: int
-    exit_ts: int
-    entry: float
-    exit: float
-    sl: float
-    tp: float
-    pnl_dollars: float
-
-
-def calc_qty(stop_dist_points: float, risk_per_trade_dollars: float, max_micros: int) -> int:
-    stop_ticks = max(1.0, stop_dist_points / TICK)
-    qty = int(risk_per_trade_dollars // (stop_ticks * TICK_VALUE))
-    qty = max(1, qty)
-    qty = min(max_micros, qty)
-    return qty
-
-
-def generate_trades(candles: List[Candle], p: Params) -> List[Trade]:
-    highs = [c.high for c in candles]
-    lows = [c.low for c in candles]
-    closes = [c.close for c in candles]
-    opens = [c.open for c in candles]
-
-    ef = ema(closes, p.regime.ema_fast)
-    es = ema(closes, p.regime.ema_slow)
-    a = atr(candles, p.regime.atr_len)
-
-    ax_drive = atr(candles, p.exits_drive.atr_len)
-    ax_chop = atr(candles, p.exits_chop.atr_len)
-
-    trades: List[Trade] = []
-
-    in_pos: Optional[Side] = None
-    in_regime: Optional[str] = None
-    qty = 0
-    entry_i = -1
-    entry_px = 0.0
-    sl = 0.0
-    tp = 0.0
-    trail = 0.0
-
-    cur_day = None
-    trades_today = 0
-    losses_today = 0
-    day_pnl = 0.0
-    cooldown = 0
-    stop_for_day = False
-
-    for i in range(2, len(candles)):
-        d = day_key_utc(candles[i].ts)
-        if d != cur_day:
-            cur_day = d
-            trades_today = 0
-            losses_today = 0
-            day_pnl = 0.0
-            cooldown = 0
-            stop_for_day = False
-
-        if cooldown > 0:
-            cooldown -= 1
-
-        # manage open
-        if in_pos is not None:
-            hi = highs[i]
-            lo = lows[i]
-
-            exits = p.exits_drive if in_regime == "drive" else p.exits_chop
-            ax = ax_drive if in_regime == "drive" else ax_chop
-
-            if ax[i] is not None:
-                tr = float(ax[i]) * exits.trail_atr_mult
-                if in_pos == "long":
-                    trail = max(trail, hi - tr)
-                    sl_eff = max(sl, trail)
-                else:
-                    trail = min(trail, lo + tr)
-                    sl_eff = min(sl, trail)
-            else:
-                sl_eff = sl
-
-            hit_sl = (lo <= sl_eff) if in_pos == "long" else (hi >= sl_eff)
-            hit_tp = (hi >= tp) if in_pos == "long" else (lo <= tp)
-
-            exit_px = None
-            if hit_sl and hit_tp:
-                exit_px = sl_eff
-            elif hit_sl:
-                exit_px = sl_eff
-            elif hit_tp:
-                exit_px = tp
-
-            if exit_px is None and (i - entry_i) >= exits.max_hold_bars:
-                exit_px = closes[i]
-
-            if exit_px is not None:
-                pnl_points = (exit_px - entry_px) if in_pos == "long" else (entry_px - exit_px)
-                pnl = dollars_from_points(pnl_points, qty_mnq=qty)
-                trades.append(
-                    Trade(
-                        side=in_pos,
-                        qty=qty,
-                        entry_ts=candles[entry_i].ts,
-                        exit_ts=candles[i].ts,
-                        entry=entry_px,
-                        exit=exit_px,
-                        sl=sl,
-                        tp=tp,
-                        pnl_dollars=pnl,
-                    )
-                )
-
-                day_pnl += pnl
-                if pnl < 0:
-                    losses_today += 1
-                    cooldown = max(cooldown, p.governor.cooldown_bars_after_loss)
-                    if losses_today >= p.governor.max_losses_per_day:
-                        stop_for_day = True
-
-                if day_pnl <= -abs(p.governor.daily_loss_stop):
-                    stop_for_day = True
-
-                in_pos = None
-                in_regime = None
-
-        if in_pos is not None:
-            continue
-
-        if stop_for_day or cooldown > 0:
-            continue
-        if trades_today >= p.governor.max_trades_per_day:
+class Signals:
+    """Per-bar loop inputs that depend only on the candles and the entry side of Params."""
+    ax_drive: List[Optional[float]]
+    ax_chop: List[Optional[float]]
+    long_sig: List[bool]
+    short_sig: List[bool]
+    drive_sig: List[bool]
+    in_sess: List[bool]
+
+
+def entry_key(p: Params) -> Params:
+    """p with the fields Signals doesn't depend on reset (exits except atr_len, governor, sizing)."""
+    return replace(
+        p,
+        risk_per_trade_dollars=0.0,
+        max_micros=0,
+        exits_drive=Exits(atr_len=p.exits_drive.atr_len),
+        exits_chop=Exits(atr_len=p.exits_chop.atr_len),
+        governor=Governor(),
+    )
+
+
+_signals_memo: SignalsMemo[Signals] = SignalsMemo(lambda cols, p: _build_signals(cols, p), entry_key)
+
+
+def precompute_signals(cols: CandleArrays, p: Params) -> Signals:
+    """Signals for (cols, p), reused across Params that share entry_key(p)."""
+    return _signals_memo.get(cols, p)
+
+
+def simulate(cols: CandleArrays, sig: Signals, p: Params) -> List[Trade]:
+    """Bar loop for p's exits/governor/sizing over precomputed signals."""
+    gov = p.governor
+    rules = DayRules(
+        gov.max_trades_per_day, gov.max_losses_per_day, gov.daily_loss_stop, gov.cooldown_bars_after_loss
+    )
+    # exit_slot is drive_sig: False -> chop exits, True -> drive exits
+    exits = (_exit_spec(sig.ax_chop, p.exits_chop), _exit_spec(sig.ax_drive, p.exits_drive))
+    return run_bars(
+        cols.ts, cols.open, cols.high, cols.low, cols.close, sig.in_sess, sig.long_sig, sig.short_sig,
+        exits, rules, p.risk_per_trade_dollars, p.max_micros, exit_slot=sig.drive_sig,
+    )
+
+
+def _exit_spec(ax: List[Optional[float]], e: Exits) -> ExitSpec:
+    return ExitSpec(ax, e.stop_atr_mult, e.trail_atr_mult, e.tp_atr_mult, e.max_hold_bars)
+
+
+def generate_trades(candles: Union[List[Candle], CandleArrays], p: Params) -> List[Trade]:
+    cols = candles if isinstance(candles, CandleArrays) else candles_to_arrays(candles)
+    return simulate(cols, precompute_signals(cols, p), p)
+
+
+def _build_signals(cols: CandleArrays, p: Params) -> Signals:
+    highs = cols.high
+    lows = cols.low
+    closes = cols.close
+    opens = cols.open
+
+    ef, es, a = ema2_atr_cached(cols, p.regime.ema_fast, p.regime.ema_slow, p.regime.atr_len)
+
+    ax_drive = atr_cached(cols, p.exits_drive.atr_len)
+    ax_chop = atr_cached(cols, p.exits_chop.atr_len)
+
+    # drive range over the lookback window ending at bar k
+    rng_high = rolling_max(highs, p.drive.lookback)
+    rng_low = rolling_min(lows, p.drive.lookback)
+
+    in_sess = session_mask_cached(cols, p.session_start_min_utc, p.session_end_min_utc)
+
+    long_sig, short_sig, drive_sig = _signals(opens, closes, ef, es, a, ax_chop, rng_high, rng_low, p)
+
+    return Signals(ax_drive, ax_chop, long_sig, short_sig, drive_sig, in_sess)
+
+
+def _signals(
+    opens: List[float],
+    closes: List[float],
+    ef: List[Optional[float]],
+    es: List[Optional[float]],
+    a: List[Optional[float]],
+    ax_chop: List[Optional[float]],
+    rng_high: List[Optional[float]],
+    rng_low: List[Optional[float]],
+    p: Params,
+) -> Tuple[List[bool], List[bool], List[bool]]:
+    """Per-bar entry signals (long, short, is_drive) for a signal bar j.
+
+    They depend only on indicator values at j, never on position/governor state,
+    so the bar loop just looks them up.
+    """
+    n = len(closes)
+    long_sig = [False] * n
+    short_sig = [False] * n
+    drive_sig = [False] * n
+
+    atr_min = p.regime.atr_min_points
+    drive_spread = p.regime.drive_spread_points
+    chop_max = p.regime.chop_max_spread_points
+    lb = p.drive.lookback
+    buf = p.drive.buffer_points
+    dev_mult = p.chop.dev_atr_mult
+    require_rev = p.chop.require_reversal_bar
+
+    for j in range(n):
+        f = ef[j]
+        s = es[j]
+        atrp = a[j]
+        if f is None or s is None or atrp is None:
             continue
-
-        j = i - 1
-        if not in_session(candles[j].ts, p.session_start_min_utc, p.session_end_min_utc):
-            continue
-
-        if ef[j] is None or es[j] is None or a[j] is None:
-            continue
-
-        atrp = float(a[j])
-        if atrp < p.regime.atr_min_points:
+        if atrp < atr_min:
             continue  # NO_TRADE
 
-        spread = abs(float(ef[j]) - float(es[j]))
-
-        is_drive = spread >= p.regime.drive_spread_points
-        is_chop = spread <= p.regime.chop_max_spread_points
-        if not (is_drive or is_chop):
-            continue  # NO_TRADE (middling regime)
-
-        long_sig = False
-        short_sig = False
-        regime = "drive" if is_drive else "chop"
-
-        if is_drive:
-            lb = p.drive.lookback
+        spread = abs(f - s)
+        if spread >= drive_spread:
             if j - lb < 1:
                 continue
-            rng_high = max(highs[j - lb : j])
-            rng_low = min(lows[j - lb : j])
-            buf = p.drive.buffer_points
-            long_sig = closes[j] > rng_high + buf and float(ef[j]) > float(es[j])
-            short_sig = closes[j] < rng_low - buf and float(ef[j]) < float(es[j])
-        else:
+            drive_sig[j] = True
+            long_sig[j] = closes[j] > rng_high[j - 1] + buf and f > s
+            short_sig[j] = closes[j] < rng_low[j - 1] - buf and f < s
+        elif spread <= chop_max:
             # CHOP: fade excursion away from fast EMA by >= dev_atr_mult*ATR
             if ax_chop[j] is None:
                 continue
-            dev = float(ax_chop[j]) * p.chop.dev_atr_mult
+            dev = ax_chop[j] * dev_mult
             # confirmation
             rev_ok_long = True
             rev_ok_short = True
-            if p.chop.require_reversal_bar:
+            if require_rev:
                 rev_ok_long = closes[j] >= opens[j]
                 rev_ok_short = closes[j] <= opens[j]
 
-            if closes[j] >= float(ef[j]) + dev and rev_ok_short:
-                short_sig = True
-            elif closes[j] <= float(ef[j]) - dev and rev_ok_long:
-                long_sig = True
-
-        if not (long_sig or short_sig):
-            continue
-
-        in_pos = "long" if long_sig else "short"
-        in_regime = regime
-        entry_i = i
-        entry_px = opens[i]
-
-        exits = p.exits_drive if regime == "drive" else p.exits_chop
-        ax = ax_drive if regime == "drive" else ax_chop
-        if ax[j] is None:
-            continue
+            if closes[j] >= f + dev and rev_ok_short:
+                short_sig[j] = True
+            elif closes[j] <= f - dev and rev_ok_long:
+                long_sig[j] = True
+        # else: NO_TRADE (middling regime)
 
-        stop_dist = float(ax[j]) * exits.stop_atr_mult
-        qty = calc_qty(stop_dist, p.risk_per_trade_dollars, p.max_micros)
-
-        if in_pos == "long":
-            sl = entry_px - stop_dist
-            trail = sl
-            tp = (
-                entry_px + float(ax[j]) * exits.tp_atr_mult
-                if exits.tp_atr_mult is not None
-                else entry_px + stop_dist * 3.0
-            )
-        else:
-            sl = entry_px + stop_dist
-            trail = sl
-            tp = (
-                entry_px - float(ax[j]) * exits.tp_atr_mult
-                if exits.tp_atr_mult is not None
-                else entry_px - stop_dist * 3.0
-            )
-
-        trades_today += 1
-
-    return trades
+    return long_sig, short_sig, drive_sig
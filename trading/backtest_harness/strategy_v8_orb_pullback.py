@@ -18,33 +18,24 @@ Research harness only.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Literal, Optional
-
-from trading.backtest_harness.tv_csv import Candle
-from trading.backtest_harness.strategy_v0 import ema, atr, dollars_from_points, TICK, TICK_VALUE
-
-Side = Literal["long", "short"]
-
-
-def minutes_utc(ts: int) -> int:
-    import datetime
-
-    d = datetime.datetime.utcfromtimestamp(ts)
-    return d.hour * 60 + d.minute
-
-
-def in_session(ts: int, start_min_utc: int, end_min_utc: int) -> bool:
-    m = minutes_utc(ts)
-    if start_min_utc <= end_min_utc:
-        return start_min_utc <= m <= end_min_utc
-    return m >= start_min_utc or m <= end_min_utc
-
-
-def day_key_utc(ts: int) -> str:
-    import datetime
-
-    return datetime.datetime.utcfromtimestamp(ts).strftime("%Y-%m-%d")
+from dataclasses import dataclass, replace
+from typing import List, Optional, Tuple, Union
+
+from trading.backtest_harness.tv_csv import Candle, CandleArrays, candles_to_arrays
+from trading.backtest_harness.strategy_v0 import ema2_atr_cached, atr_cached, rolling_max, rolling_min, session_mask_cached
+from trading.backtest_harness.strategy_common import (
+    _DOLLARS_PER_POINT,
+    DayRules,
+    ExitSpec,
+    Side,
+    SignalsMemo,
+    Trade,
+    calc_qty,
+    day_key_utc,
+    in_session,
+    minutes_utc,
+    run_bars,
+)
 
 
 @dataclass(frozen=True)
@@ -129,243 +120,222 @@ class Params:
 
 
 @dataclass(frozen=True)
-class Trade:
-    side: Side
-    qty: int
-    entry_ts: int
-    exit_ts: int
-    entry: float
-    exit: float
-    sl: float
-    tp: float
-    pnl_dollars: float
-
-
-def calc_qty(stop_dist_points: float, risk_per_trade_dollars: float, max_micros: int) -> int:
-    stop_ticks = max(1.0, stop_dist_points / TICK)
-    qty = int(risk_per_trade_dollars // (stop_ticks * TICK_VALUE))
-    qty = max(1, qty)
-    qty = min(max_micros, qty)
-    return qty
-
-
-def generate_trades(candles: List[Candle], p: Params) -> List[Trade]:
-    highs = [c.high for c in candles]
-    lows = [c.low for c in candles]
-    closes = [c.close for c in candles]
-    opens = [c.open for c in candles]
-
-    ef = ema(closes, p.regime.ema_fast)
-    es = ema(closes, p.regime.ema_slow)
-    a = atr(candles, p.regime.atr_len)
-    ax = atr(candles, p.exits.atr_len)
-
-    trades: List[Trade] = []
-
-    in_pos: Optional[Side] = None
-    qty = 0
-    entry_i = -1
-    entry_px = 0.0
-    sl = 0.0
-    tp = 0.0
-    trail = 0.0
-
-    cur_day = None
-    trades_today = 0
-    losses_today = 0
-    day_pnl = 0.0
-    cooldown = 0
-    stop_for_day = False
-
-    last_cross_i = -999999
-    press_mode = False
-    first_trade_done = False
-
-    for i in range(2, len(candles)):
-        d = day_key_utc(candles[i].ts)
-        if d != cur_day:
-            cur_day = d
-            trades_today = 0
-            losses_today = 0
-            day_pnl = 0.0
-            cooldown = 0
-            stop_for_day = False
-            press_mode = False
-            first_trade_done = False
-
-        if cooldown > 0:
-            cooldown -= 1
-
-        # manage open
-        if in_pos is not None:
-            hi = highs[i]
-            lo = lows[i]
-
-            if ax[i] is not None:
-                tr = float(ax[i]) * p.exits.trail_atr_mult
-                if in_pos == "long":
-                    trail = max(trail, hi - tr)
-                    sl_eff = max(sl, trail)
-                else:
-                    trail = min(trail, lo + tr)
-                    sl_eff = min(sl, trail)
-            else:
-                sl_eff = sl
-
-            hit_sl = (lo <= sl_eff) if in_pos == "long" else (hi >= sl_eff)
-            hit_tp = (hi >= tp) if in_pos == "long" else (lo <= tp)
-
-            exit_px = None
-            if hit_sl and hit_tp:
-                exit_px = sl_eff
-            elif hit_sl:
-                exit_px = sl_eff
-            elif hit_tp:
-                exit_px = tp
-
-            if exit_px is None and (i - entry_i) >= p.exits.max_hold_bars:
-                exit_px = closes[i]
-
-            if exit_px is not None:
-                pnl_points = (exit_px - entry_px) if in_pos == "long" else (entry_px - exit_px)
-                pnl = dollars_from_points(pnl_points, qty_mnq=qty)
-                trades.append(
-                    Trade(
-                        side=in_pos,
-                        qty=qty,
-                        entry_ts=candles[entry_i].ts,
-                        exit_ts=candles[i].ts,
-                        entry=entry_px,
-                        exit=exit_px,
-                        sl=sl,
-                        tp=tp,
-                        pnl_dollars=pnl,
-                    )
-                )
-
-                day_pnl += pnl
-                if not first_trade_done:
-                    first_trade_done = True
-                    # enable press mode only if first trade is a win AND it happened during open engine
-                    if pnl > 0 and in_session(candles[entry_i].ts, p.open_start_min_utc, p.open_end_min_utc):
-                        press_mode = True
-
-                if pnl < 0:
-                    losses_today += 1
-                    cooldown = max(cooldown, p.governor.cooldown_bars_after_loss)
-                    if p.governor.stop_after_first_loss:
-                        stop_for_day = True
-                    if losses_today >= p.governor.max_losses_per_day:
-                        stop_for_day = True
-
-                if day_pnl <= -abs(p.governor.daily_loss_stop):
-                    stop_for_day = True
-
-                # daily target ladder
-                target = p.governor.daily_profit_target_press if press_mode else p.governor.daily_profit_target_base
-                if day_pnl >= abs(target):
-                    stop_for_day = True
-
-                in_pos = None
-
-        if in_pos is not None:
-            continue
-
-        if stop_for_day or cooldown > 0:
-            continue
-        if trades_today >= p.governor.max_trades_per_day:
-            continue
-
-        j = i - 1
-        if not in_session(candles[j].ts, p.session_start_min_utc, p.session_end_min_utc):
-            continue
-
-        if ef[j] is None or es[j] is None or a[j] is None or ax[j] is None:
+class Signals:
+    """Per-bar loop inputs that depend only on the candles and the entry side of Params."""
+    ax: List[Optional[float]]
+    gate: List[bool]
+    crossed: List[bool]
+    orb_long: List[bool]
+    orb_short: List[bool]
+    pull_long: List[bool]
+    pull_short: List[bool]
+    pull_gap: List[Optional[int]]
+    in_open_sess: List[bool]
+
+
+def entry_key(p: Params) -> Params:
+    """p with the fields Signals doesn't depend on reset (exits except atr_len, governor, sizing)."""
+    return replace(
+        p,
+        risk_per_trade_dollars=0.0,
+        max_micros=0,
+        exits=Exits(atr_len=p.exits.atr_len),
+        governor=Governor(),
+    )
+
+
+_signals_memo: SignalsMemo[Signals] = SignalsMemo(lambda cols, p: _build_signals(cols, p), entry_key)
+
+
+def precompute_signals(cols: CandleArrays, p: Params) -> Signals:
+    """Signals for (cols, p), reused across Params that share entry_key(p)."""
+    return _signals_memo.get(cols, p)
+
+
+def simulate(cols: CandleArrays, sig: Signals, p: Params) -> List[Trade]:
+    """Bar loop for p's exits/governor/sizing over precomputed signals."""
+    gov = p.governor
+    rules = DayRules(
+        gov.max_trades_per_day,
+        gov.max_losses_per_day,
+        gov.daily_loss_stop,
+        gov.cooldown_bars_after_loss,
+        gov.stop_after_first_loss,
+        gov.daily_profit_target_base,
+        gov.daily_profit_target_press,
+    )
+    e = p.exits
+    exits = (ExitSpec(sig.ax, e.stop_atr_mult, e.trail_atr_mult, e.tp_atr_mult, e.max_hold_bars),)
+    if not (p.open_pullback.enabled or p.day_pullback.enabled):
+        # ORB only: the cross tracking feeds nothing, so skip it in the loop
+        return run_bars(
+            cols.ts, cols.open, cols.high, cols.low, cols.close, sig.gate, sig.orb_long, sig.orb_short,
+            exits, rules, p.risk_per_trade_dollars, p.max_micros, press_sess=sig.in_open_sess,
+        )
+    return run_bars(
+        cols.ts, cols.open, cols.high, cols.low, cols.close, sig.gate, sig.orb_long, sig.orb_short,
+        exits, rules, p.risk_per_trade_dollars, p.max_micros,
+        crossed=sig.crossed, pull_long=sig.pull_long, pull_short=sig.pull_short, pull_gap=sig.pull_gap,
+        press_sess=sig.in_open_sess,
+    )
+
+
+def generate_trades(candles: Union[List[Candle], CandleArrays], p: Params) -> List[Trade]:
+    cols = candles if isinstance(candles, CandleArrays) else candles_to_arrays(candles)
+    return simulate(cols, precompute_signals(cols, p), p)
+
+
+def _build_signals(cols: CandleArrays, p: Params) -> Signals:
+    highs = cols.high
+    lows = cols.low
+    closes = cols.close
+
+    ef, es, a = ema2_atr_cached(cols, p.regime.ema_fast, p.regime.ema_slow, p.regime.atr_len)
+    ax = atr_cached(cols, p.exits.atr_len)
+
+    # ORB ranges over the lookback window ending at bar k (open / rest-of-day)
+    open_rng_high = rolling_max(highs, p.open_orb.lookback)
+    open_rng_low = rolling_min(lows, p.open_orb.lookback)
+    if p.day_orb.lookback == p.open_orb.lookback:
+        day_rng_high, day_rng_low = open_rng_high, open_rng_low
+    else:
+        day_rng_high = rolling_max(highs, p.day_orb.lookback)
+        day_rng_low = rolling_min(lows, p.day_orb.lookback)
+
+    in_sess = session_mask_cached(cols, p.session_start_min_utc, p.session_end_min_utc)
+    in_open_sess = session_mask_cached(cols, p.open_start_min_utc, p.open_end_min_utc)
+
+    valid, spread, trend = _regime(ef, es, a, ax, p.regime.atr_min_points)
+    crossed = _ema_crosses(closes, ef)
+
+    confirm_frac = p.open_confirm_frac if p.open_confirm_enabled else None
+    margin_atr = p.open_pullback_ema_margin_atr if p.open_confirm_enabled else None
+    open_orb_long, open_orb_short = _orb_signals(
+        closes, highs, lows, trend, open_rng_high, open_rng_low, p.open_orb, confirm_frac
+    )
+    day_orb_long, day_orb_short = _orb_signals(closes, highs, lows, trend, day_rng_high, day_rng_low, p.day_orb, None)
+    open_pull_long, open_pull_short = _pullback_signals(closes, ef, ax, trend, p.open_pullback, margin_atr)
+    day_pull_long, day_pull_short = _pullback_signals(closes, ef, ax, trend, p.day_pullback, None)
+
+    # Resolve the open-vs-day engine per bar once, so the loop reads one table each.
+    open_min, day_min = p.open_min_spread_points, p.regime.min_spread_points
+    gate = [
+        sess and ok and sp >= (open_min if op else day_min)
+        for sess, ok, sp, op in zip(in_sess, valid, spread, in_open_sess)
+    ]
+    orb_long = _by_engine(in_open_sess, open_orb_long, day_orb_long)
+    orb_short = _by_engine(in_open_sess, open_orb_short, day_orb_short)
+    pull_long = _by_engine(in_open_sess, open_pull_long, day_pull_long)
+    pull_short = _by_engine(in_open_sess, open_pull_short, day_pull_short)
+    open_gap = p.open_pullback.min_bars_since_cross if p.open_pullback.enabled else None
+    day_gap = p.day_pullback.min_bars_since_cross if p.day_pullback.enabled else None
+    pull_gap = [open_gap if op else day_gap for op in in_open_sess]
+
+    return Signals(ax, gate, crossed, orb_long, orb_short, pull_long, pull_short, pull_gap, in_open_sess)
+
+
+def _by_engine(in_open: List[bool], open_vals: List[bool], day_vals: List[bool]) -> List[bool]:
+    return [o if op else d for op, o, d in zip(in_open, open_vals, day_vals)]
+
+
+def _regime(
+    ef: List[Optional[float]],
+    es: List[Optional[float]],
+    a: List[Optional[float]],
+    ax: List[Optional[float]],
+    atr_min: float,
+) -> Tuple[List[bool], List[float], List[int]]:
+    """Per-bar regime gate (indicators ready and ATR >= min), EMA spread and trend sign (+1/-1/0).
+
+    spread/trend are 0 where the gate is closed.
+    """
+    n = len(ef)
+    valid = [False] * n
+    spread = [0.0] * n
+    trend = [0] * n
+    for j in range(n):
+        f = ef[j]
+        s = es[j]
+        if f is None or s is None or a[j] is None or ax[j] is None:
             continue
-
-        atrp = float(a[j])
-        if atrp < p.regime.atr_min_points:
+        if a[j] < atr_min:
             continue
-
-        in_open = in_session(candles[j].ts, p.open_start_min_utc, p.open_end_min_utc)
-
-        spread = abs(float(ef[j]) - float(es[j]))
-        min_spread = p.open_min_spread_points if in_open else p.regime.min_spread_points
-        if spread < min_spread:
-            continue
-
-        trend_up = float(ef[j]) > float(es[j])
-        trend_dn = float(ef[j]) < float(es[j])
-
-        # track pullback cross of fast EMA
-        if closes[j - 1] is not None and ef[j - 1] is not None:
-            prev_above = closes[j - 1] > float(ef[j - 1])
-            now_above = closes[j] > float(ef[j])
-            if prev_above != now_above:
-                last_cross_i = j
-
-        orb = p.open_orb if in_open else p.day_orb
-        pull = p.open_pullback if in_open else p.day_pullback
-
-        long_sig = False
-        short_sig = False
-
-        # Entry A: ORB breakout
-        lb = orb.lookback
-        if j - lb >= 1:
-            rng_high = max(highs[j - lb : j])
-            rng_low = min(lows[j - lb : j])
-            buf = orb.buffer_points
-
-            if trend_up and closes[j] > rng_high + buf:
-                long_sig = True
-            if trend_dn and closes[j] < rng_low - buf:
-                short_sig = True
-
-            # Open confirmation: avoid weak closes on fake breakouts
-            if in_open and p.open_confirm_enabled:
+        valid[j] = True
+        spread[j] = abs(f - s)
+        trend[j] = 1 if f > s else (-1 if f < s else 0)
+    return valid, spread, trend
+
+
+def _ema_crosses(closes: List[float], ef: List[Optional[float]]) -> List[bool]:
+    """True at bar j when the close moved to the other side of the fast EMA vs bar j-1.
+
+    Bars-since-cross can't be precomputed from this: the loop only records a cross on
+    bars that reach the entry gate (flat, governor open, gate[j]), so it's path-dependent.
+    """
+    n = len(closes)
+    crossed = [False] * n
+    for j in range(1, n):
+        prev_ef = ef[j - 1]
+        if prev_ef is not None:
+            crossed[j] = (closes[j - 1] > prev_ef) != (closes[j] > ef[j])
+    return crossed
+
+
+def _orb_signals(
+    closes: List[float],
+    highs: List[float],
+    lows: List[float],
+    trend: List[int],
+    rng_high: List[Optional[float]],
+    rng_low: List[Optional[float]],
+    orb: ORB,
+    confirm_frac: Optional[float],
+) -> Tuple[List[bool], List[bool]]:
+    """ORB breakout with the trend; confirm_frac drops closes outside the top/bottom of the bar range."""
+    n = len(closes)
+    long_sig = [False] * n
+    short_sig = [False] * n
+    buf = orb.buffer_points
+    for j in range(max(orb.lookback + 1, 1), n):
+        t = trend[j]
+        if t > 0 and closes[j] > rng_high[j - 1] + buf:
+            long_sig[j] = True
+            if confirm_frac is not None:
                 r = max(1e-9, highs[j] - lows[j])
-                frac = p.open_confirm_frac
-                if long_sig and closes[j] < lows[j] + frac * r:
-                    long_sig = False
-                if short_sig and closes[j] > highs[j] - frac * r:
-                    short_sig = False
-
-        # Entry B: pullback continuation
-        if pull.enabled and not (long_sig or short_sig):
-            if (j - last_cross_i) >= pull.min_bars_since_cross:
-                if trend_up and closes[j - 1] < float(ef[j - 1]) and closes[j] > float(ef[j]):
-                    long_sig = True
-                if trend_dn and closes[j - 1] > float(ef[j - 1]) and closes[j] < float(ef[j]):
-                    short_sig = True
-
-            # Open confirmation for pullbacks: require some distance beyond EMA
-            if in_open and p.open_confirm_enabled and (long_sig or short_sig) and ax[j] is not None:
-                margin = float(ax[j]) * p.open_pullback_ema_margin_atr
-                if long_sig and (closes[j] - float(ef[j])) < margin:
-                    long_sig = False
-                if short_sig and (float(ef[j]) - closes[j]) < margin:
-                    short_sig = False
-
-        if not (long_sig or short_sig):
+                if closes[j] < lows[j] + confirm_frac * r:
+                    long_sig[j] = False
+        elif t < 0 and closes[j] < rng_low[j - 1] - buf:
+            short_sig[j] = True
+            if confirm_frac is not None:
+                r = max(1e-9, highs[j] - lows[j])
+                if closes[j] > highs[j] - confirm_frac * r:
+                    short_sig[j] = False
+    return long_sig, short_sig
+
+
+def _pullback_signals(
+    closes: List[float],
+    ef: List[Optional[float]],
+    ax: List[Optional[float]],
+    trend: List[int],
+    pull: Pullback,
+    margin_atr: Optional[float],
+) -> Tuple[List[bool], List[bool]]:
+    """Close re-crossing the fast EMA with the trend; margin_atr requires distance beyond the EMA.
+
+    The bars-since-cross gate depends on loop state and is applied in the bar loop.
+    """
+    n = len(closes)
+    long_sig = [False] * n
+    short_sig = [False] * n
+    if not pull.enabled:
+        return long_sig, short_sig
+    for j in range(1, n):
+        t = trend[j]
+        if t == 0 or ef[j - 1] is None:
             continue
-
-        in_pos = "long" if long_sig else "short"
-        entry_i = i
-        entry_px = opens[i]
-
-        stop_dist = float(ax[j]) * p.exits.stop_atr_mult
-        qty = calc_qty(stop_dist, p.risk_per_trade_dollars, p.max_micros)
-
-        if in_pos == "long":
-            sl = entry_px - stop_dist
-            trail = sl
-            tp = entry_px + float(ax[j]) * p.exits.tp_atr_mult
-        else:
-            sl = entry_px + stop_dist
-            trail = sl
-            tp = entry_px - float(ax[j]) * p.exits.tp_atr_mult
-
-        trades_today += 1
-
-    return trades
+        if t > 0 and closes[j - 1] < ef[j - 1] and closes[j] > ef[j]:
+            long_sig[j] = margin_atr is None or (closes[j] - ef[j]) >= ax[j] * margin_atr
+        elif t < 0 and closes[j - 1] > ef[j - 1] and closes[j] < ef[j]:
+            short_sig[j] = margin_atr is None or (ef[j] - closes[j]) >= ax[j] * margin_atr
+    return long_sig, short_sig
@@ -14,33 +14,24 @@ Research harness only.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Literal, Optional
-
-from trading.backtest_harness.tv_csv import Candle
-from trading.backtest_harness.strategy_v0 import ema, atr, dollars_from_points, TICK, TICK_VALUE
-
-Side = Literal["long", "short"]
-
-
-def minutes_utc(ts: int) -> int:
-    import datetime
-
-    d = datetime.datetime.utcfromtimestamp(ts)
-    return d.hour * 60 + d.minute
-
-
-def in_session(ts: int, start_min_utc: int, end_min_utc: int) -> bool:
-    m = minutes_utc(ts)
-    if start_min_utc <= end_min_utc:
-        return start_min_utc <= m <= end_min_utc
-    return m >= start_min_utc or m <= end_min_utc
-
-
-def day_key_utc(ts: int) -> str:
-    import datetime
-
-    return datetime.datetime.utcfromtimestamp(ts).strftime("%Y-%m-%d")
+from dataclasses import dataclass, replace
+from typing import List, Optional, Tuple, Union
+
+from trading.backtest_harness.tv_csv import Candle, CandleArrays, candles_to_arrays
+from trading.backtest_harness.strategy_v0 import ema2_atr_cached, atr_cached, session_mask_cached
+from trading.backtest_harness.strategy_common import (
+    _DOLLARS_PER_POINT,
+    DayRules,
+    ExitSpec,
+    Side,
+    SignalsMemo,
+    Trade,
+    calc_qty,
+    day_key_utc,
+    in_session,
+    minutes_utc,
+    run_bars,
+)
 
 
 @dataclass(frozen=True)
@@ -98,201 +89,113 @@ class Params:
 
 
 @dataclass(frozen=True)
-class Trade:
-    side: Side
-    qty: int
-    entry_ts: int
-    exit_ts: int
-    entry: float
-    exit: float
-    sl: float
-    tp: float
-    pnl_dollars: float
-
-
-def calc_qty(stop_dist_points: float, risk_per_trade_dollars: float, max_micros: int) -> int:
-    stop_ticks = max(1.0, stop_dist_points / TICK)
-    qty = int(risk_per_trade_dollars // (stop_ticks * TICK_VALUE))
-    qty = max(1, qty)
-    qty = min(max_micros, qty)
-    return qty
-
-
-def generate_trades(candles: List[Candle], p: Params) -> List[Trade]:
-    highs = [c.high for c in candles]
-    lows = [c.low for c in candles]
-    closes = [c.close for c in candles]
-    opens = [c.open for c in candles]
-
-    ef = ema(closes, p.regime.ema_fast)
-    es = ema(closes, p.regime.ema_slow)
-    a = atr(candles, p.regime.atr_len)
-    ax = atr(candles, p.exits.atr_len)
-
-    trades: List[Trade] = []
-
-    in_pos: Optional[Side] = None
-    qty = 0
-    entry_i = -1
-    entry_px = 0.0
-    sl = 0.0
-    tp = 0.0
-    trail = 0.0
-
-    cur_day = None
-    trades_today = 0
-    losses_today = 0
-    day_pnl = 0.0
-    cooldown = 0
-    stop_for_day = False
-    press_mode = False
-    first_trade_done = False
-
-    for i in range(2, len(candles)):
-        d = day_key_utc(candles[i].ts)
-        if d != cur_day:
-            cur_day = d
-            trades_today = 0
-            losses_today = 0
-            day_pnl = 0.0
-            cooldown = 0
-            stop_for_day = False
-            press_mode = False
-            first_trade_done = False
-
-        if cooldown > 0:
-            cooldown -= 1
-
-        # manage open
-        if in_pos is not None:
-            hi = highs[i]
-            lo = lows[i]
-
-            if ax[i] is not None:
-                tr = float(ax[i]) * p.exits.trail_atr_mult
-                if in_pos == "long":
-                    trail = max(trail, hi - tr)
-                    sl_eff = max(sl, trail)
-                else:
-                    trail = min(trail, lo + tr)
-                    sl_eff = min(sl, trail)
-            else:
-                sl_eff = sl
-
-            hit_sl = (lo <= sl_eff) if in_pos == "long" else (hi >= sl_eff)
-            hit_tp = (hi >= tp) if in_pos == "long" else (lo <= tp)
-
-            exit_px = None
-            if hit_sl and hit_tp:
-                exit_px = sl_eff
-            elif hit_sl:
-                exit_px = sl_eff
-            elif hit_tp:
-                exit_px = tp
-
-            if exit_px is None and (i - entry_i) >= p.exits.max_hold_bars:
-                exit_px = closes[i]
-
-            if exit_px is not None:
-                pnl_points = (exit_px - entry_px) if in_pos == "long" else (entry_px - exit_px)
-                pnl = dollars_from_points(pnl_points, qty_mnq=qty)
-                trades.append(
-                    Trade(
-                        side=in_pos,
-                        qty=qty,
-                        entry_ts=candles[entry_i].ts,
-                        exit_ts=candles[i].ts,
-                        entry=entry_px,
-                        exit=exit_px,
-                        sl=sl,
-                        tp=tp,
-                        pnl_dollars=pnl,
-                    )
-                )
-
-                day_pnl += pnl
-                if not first_trade_done:
-                    first_trade_done = True
-                    if pnl > 0:
-                        press_mode = True
-
-                if pnl < 0:
-                    losses_today += 1
-                    cooldown = max(cooldown, p.governor.cooldown_bars_after_loss)
-                    if p.governor.stop_after_first_loss:
-                        stop_for_day = True
-                    if losses_today >= p.governor.max_losses_per_day:
-                        stop_for_day = True
-
-                if day_pnl <= -abs(p.governor.daily_loss_stop):
-                    stop_for_day = True
-
-                target = p.governor.daily_profit_target_press if press_mode else p.governor.daily_profit_target_base
-                if day_pnl >= abs(target):
-                    stop_for_day = True
-
-                in_pos = None
-
-        if in_pos is not None:
+class Signals:
+    """Per-bar loop inputs that depend only on the candles and the entry side of Params."""
+    ax: List[Optional[float]]
+    long_sig: List[bool]
+    short_sig: List[bool]
+    in_open: List[bool]
+
+
+def entry_key(p: Params) -> Params:
+    """p with the fields Signals doesn't depend on reset (exits except atr_len, governor, sizing)."""
+    return replace(
+        p,
+        risk_per_trade_dollars=0.0,
+        max_micros=0,
+        exits=Exits(atr_len=p.exits.atr_len),
+        governor=Governor(),
+    )
+
+
+_signals_memo: SignalsMemo[Signals] = SignalsMemo(lambda cols, p: _build_signals(cols, p), entry_key)
+
+
+def precompute_signals(cols: CandleArrays, p: Params) -> Signals:
+    """Signals for (cols, p), reused across Params that share entry_key(p)."""
+    return _signals_memo.get(cols, p)
+
+
+def simulate(cols: CandleArrays, sig: Signals, p: Params) -> List[Trade]:
+    """Bar loop for p's exits/governor/sizing over precomputed signals."""
+    gov = p.governor
+    rules = DayRules(
+        gov.max_trades_per_day,
+        gov.max_losses_per_day,
+        gov.daily_loss_stop,
+        gov.cooldown_bars_after_loss,
+        gov.stop_after_first_loss,
+        gov.daily_profit_target_base,
+        gov.daily_profit_target_press,
+    )
+    e = p.exits
+    exits = (ExitSpec(sig.ax, e.stop_atr_mult, e.trail_atr_mult, e.tp_atr_mult, e.max_hold_bars),)
+    # no press_sess: any winning first trade presses, wherever it was entered
+    return run_bars(
+        cols.ts, cols.open, cols.high, cols.low, cols.close, sig.in_open, sig.long_sig, sig.short_sig,
+        exits, rules, p.risk_per_trade_dollars, p.max_micros,
+    )
+
+
+def generate_trades(candles: Union[List[Candle], CandleArrays], p: Params) -> List[Trade]:
+    cols = candles if isinstance(candles, CandleArrays) else candles_to_arrays(candles)
+    return simulate(cols, precompute_signals(cols, p), p)
+
+
+def _build_signals(cols: CandleArrays, p: Params) -> Signals:
+    ef, es, a = ema2_atr_cached(cols, p.regime.ema_fast, p.regime.ema_slow, p.regime.atr_len)
+    ax = atr_cached(cols, p.exits.atr_len)
+
+    # open-window flag per bar (integer minute of day, no datetime in the loop); cached per
+    # window, so sweeps over several sessions on one series build each mask once
+    in_open = session_mask_cached(cols, p.open_start_min_utc, p.open_end_min_utc)
+    long_sig, short_sig = _signals(cols.open, cols.close, ef, es, a, ax, in_open, p)
+
+    return Signals(ax, long_sig, short_sig, in_open)
+
+
+def _signals(
+    opens: List[float],
+    closes: List[float],
+    ef: List[Optional[float]],
+    es: List[Optional[float]],
+    a: List[Optional[float]],
+    ax: List[Optional[float]],
+    in_open: List[bool],
+    p: Params,
+) -> Tuple[List[bool], List[bool]]:
+    """Per-bar snapback entry signals (long, short) for a signal bar j.
+
+    They depend only on the open window and indicator values at j, never on
+    position/governor state, so the bar loop just looks them up.
+    """
+    n = len(closes)
+    long_sig = [False] * n
+    short_sig = [False] * n
+
+    atr_min = p.regime.atr_min_points
+    dev_mult = p.snap.dev_atr_mult
+    require_rev = p.snap.require_reversal_bar
+    use_spread_filter = p.snap.use_spread_filter
+    max_spread = p.snap.max_spread_points
+
+    for j in range(n):
+        if not in_open[j]:
             continue
-
-        if stop_for_day or cooldown > 0:
+        f = ef[j]
+        if f is None or es[j] is None or a[j] is None or ax[j] is None:
             continue
-        if trades_today >= p.governor.max_trades_per_day:
+        if a[j] < atr_min:
             continue
-
-        j = i - 1
-        if not in_session(candles[j].ts, p.open_start_min_utc, p.open_end_min_utc):
+        if use_spread_filter and abs(f - es[j]) > max_spread:
             continue
 
-        if ef[j] is None or es[j] is None or a[j] is None or ax[j] is None:
-            continue
-
-        if float(a[j]) < p.regime.atr_min_points:
-            continue
-
-        if p.snap.use_spread_filter:
-            spread = abs(float(ef[j]) - float(es[j]))
-            if spread > p.snap.max_spread_points:
-                continue
-
-        dev = float(ax[j]) * p.snap.dev_atr_mult
-
-        long_sig = False
-        short_sig = False
-
-        # fade excursion away from EMA fast
-        if closes[j] <= float(ef[j]) - dev:
-            long_sig = True
-        elif closes[j] >= float(ef[j]) + dev:
-            short_sig = True
-
-        if p.snap.require_reversal_bar and (long_sig or short_sig):
-            # require reversal body direction
-            if long_sig and closes[j] < opens[j]:
-                long_sig = False
-            if short_sig and closes[j] > opens[j]:
-                short_sig = False
-
-        if not (long_sig or short_sig):
-            continue
-
-        in_pos = "long" if long_sig else "short"
-        entry_i = i
-        entry_px = opens[i]
-
-        stop_dist = float(ax[j]) * p.exits.stop_atr_mult
-        qty = calc_qty(stop_dist, p.risk_per_trade_dollars, p.max_micros)
-
-        if in_pos == "long":
-            sl = entry_px - stop_dist
-            trail = sl
-            tp = entry_px + float(ax[j]) * p.exits.tp_atr_mult
-        else:
-            sl = entry_px + stop_dist
-            trail = sl
-            tp = entry_px - float(ax[j]) * p.exits.tp_atr_mult
+        dev = ax[j] * dev_mult
+        # fade excursion away from EMA fast; optionally require reversal body direction
+        if closes[j] <= f - dev:
+            long_sig[j] = not (require_rev and closes[j] < opens[j])
+        elif closes[j] >= f + dev:
+            short_sig[j] = not (require_rev and closes[j] > opens[j])
 
-        trades_today += 1
+    return long_sig, short_sig
 
-    return trades
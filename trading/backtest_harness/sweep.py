@@ -2,10 +2,14 @@
 
 For now we sweep the toy DailyPnlModel to validate the sweep/reporting pipeline.
 Later this will sweep strategy parameters on real MNQ candle data.
+
+Grid points are independent, so sweep_daily_model can fan out over a process
+pool. Default is workers=1 (in-process), per SAFE_MODE.md.
 """
 
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from typing import List, Tuple
 
@@ -27,18 +31,27 @@ def sweep_daily_model(
     win_vals: List[float] = [200, 250, 300, 350],
     loss_vals: List[float] = [-150, -200, -250],
     seed: int = 42,
+    workers: int = 1,
 ) -> List[SweepRow]:
-    rows: List[SweepRow] = []
-    for p in p_win_vals:
-        for w in win_vals:
-            for l in loss_vals:
-                s = run_eval_batch(n=n, model=DailyPnlModel(p_win=p, win=w, loss=l), seed=seed)
-                rows.append(SweepRow(p, w, l, s.pass_rate, s.avg_days))
+    # every grid point reuses the same seed, so rows don't depend on workers
+    grid = [(n, p, w, l, seed) for p in p_win_vals for w in win_vals for l in loss_vals]
+    if workers <= 1 or len(grid) <= 1:
+        rows = [_run_one(g) for g in grid]
+    else:
+        chunksize = max(1, len(grid) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            rows = list(ex.map(_run_one, grid, chunksize=chunksize))
 
     rows.sort(key=lambda r: (r.pass_rate, -r.avg_days), reverse=True)
     return rows
 
 
+def _run_one(g: Tuple[int, float, float, float, int]) -> SweepRow:
+    n, p, w, l, seed = g
+    s = run_eval_batch(n=n, model=DailyPnlModel(p_win=p, win=w, loss=l), seed=seed)
+    return SweepRow(p, w, l, s.pass_rate, s.avg_days)
+
+
 def format_top(rows: List[SweepRow], k: int = 10) -> str:
     lines = ["top configs (toy daily-PnL):"]
     for r in rows[:k]:
@@ -0,0 +1,35 @@
+"""Synthetic MNQ-like candles for tests and quick local checks.
+
+Prices move on the 0.25 tick grid, so PnL math stays exact.
+
+No external deps.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import List
+
+from trading.backtest_harness.tv_csv import Candle
+
+
+def random_walk_candles(
+    seed: int,
+    n: int,
+    step_s: int = 60,
+    move_ticks: int = 40,
+    wick_ticks: int = 20,
+    start_ts: int = 1_700_000_000,
+    start_px: float = 20000.0,
+) -> List[Candle]:
+    """n bars, step_s apart: each close moves up to move_ticks from the open, wicks up to wick_ticks past the body."""
+    rng = random.Random(seed)
+    out: List[Candle] = []
+    px = start_px
+    for i in range(n):
+        o = px
+        px += rng.choice([-1, 1]) * rng.randint(0, move_ticks) * 0.25
+        hi = max(o, px) + rng.randint(0, wick_ticks) * 0.25
+        lo = min(o, px) - rng.randint(0, wick_ticks) * 0.25
+        out.append(Candle(ts=start_ts + step_s * i, open=o, high=hi, low=lo, close=px))
+    return out
@@ -0,0 +1,42 @@
+import random
+
+from trading.backtest_harness.strategy_v0 import dollars_from_points
+from trading.backtest_harness import (
+    strategy_v4_retest,
+    strategy_v5_regime_drive,
+    strategy_v6_orb_drive,
+    strategy_v7_regime_switch,
+    strategy_v8_orb_pullback,
+)
+
+
+def test_inlined_multiplier_matches_dollars_from_points():
+    rng = random.Random(7)
+    for mod in (
+        strategy_v4_retest,
+        strategy_v5_regime_drive,
+        strategy_v6_orb_drive,
+        strategy_v7_regime_switch,
+        strategy_v8_orb_pullback,
+    ):
+        for _ in range(10000):
+            points = rng.uniform(-200.0, 200.0)
+            qty = rng.randint(1, 20)
+            assert points * mod._DOLLARS_PER_POINT * qty == dollars_from_points(points, qty_mnq=qty)
+
+
+def test_calc_qty_matches_tick_formula():
+    from trading.backtest_harness.strategy_v0 import TICK, TICK_VALUE
+
+    def ref(stop, risk, max_micros):
+        stop_ticks = max(1.0, stop / TICK)
+        qty = int(risk // (stop_ticks * TICK_VALUE))
+        return min(max_micros, max(1, qty))
+
+    rng = random.Random(8)
+    for mod in (strategy_v7_regime_switch, strategy_v8_orb_pullback):
+        for _ in range(10000):
+            stop = rng.choice([rng.uniform(0.0, 60.0), rng.randint(0, 200) * 0.25])
+            risk = rng.choice([rng.uniform(0.0, 500.0), float(rng.randint(0, 400))])
+            max_micros = rng.randint(0, 30)
+            assert mod.calc_qty(stop, risk, max_micros) == ref(stop, risk, max_micros)
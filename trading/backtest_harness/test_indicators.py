@@ -0,0 +1,67 @@
+import random
+
+from trading.backtest_harness.strategy_v0 import rolling_max, rolling_min
+
+
+def test_rolling_max_min_match_slice_scan():
+    rng = random.Random(1)
+    for _ in range(300):
+        xs = [float(rng.randint(0, 20)) for _ in range(rng.randint(0, 60))]
+        n = rng.randint(1, 10)
+        want_hi = [max(xs[i - n + 1 : i + 1]) if i >= n - 1 else None for i in range(len(xs))]
+        want_lo = [min(xs[i - n + 1 : i + 1]) if i >= n - 1 else None for i in range(len(xs))]
+        assert rolling_max(xs, n) == want_hi
+        assert rolling_min(xs, n) == want_lo
+
+
+def test_generate_trades_same_for_candle_arrays():
+    from trading.backtest_harness import strategy_v7_regime_switch as v7, strategy_v8_orb_pullback as v8
+    from trading.backtest_harness import strategy_v9_open_snapback as v9
+    from trading.backtest_harness import strategy_v5_regime_drive as v5
+    from trading.backtest_harness.synthetic import random_walk_candles
+    from trading.backtest_harness.tv_csv import candles_to_arrays
+
+    candles = random_walk_candles(2, 3000)
+    cols = candles_to_arrays(candles)
+    assert list(cols) == candles and cols[-1] == candles[-1] and cols[5:9] == candles[5:9]
+    assert list(cols.window(5, 9)) == candles[5:9]
+    for mod in (v5, v7, v8, v9):
+        p = mod.Params(regime=mod.Regime(atr_min_points=2.0))
+        assert mod.generate_trades(cols, p) == mod.generate_trades(candles, p)
+
+
+def test_cached_indicators_follow_source_identity():
+    from trading.backtest_harness.strategy_v0 import atr_cached, atr_hlc, ema, ema_cached
+    from trading.backtest_harness.tv_csv import CandleArrays
+
+    rng = random.Random(3)
+
+    def cols():
+        closes = [float(rng.randint(0, 400)) for _ in range(200)]
+        return CandleArrays(
+            ts=list(range(200)),
+            open=closes,
+            high=[c + rng.randint(0, 8) for c in closes],
+            low=[c - rng.randint(0, 8) for c in closes],
+            close=closes,
+        )
+
+    a, b = cols(), cols()
+    for src in (a, b, a):
+        assert ema_cached(src, 10) == ema(src.close, 10)
+        assert atr_cached(src, 14) == atr_hlc(src.high, src.low, src.close, 14)
+        assert atr_cached(src, 14) is atr_cached(src, 14)
+
+
+def test_fused_ema2_atr_matches_separate_passes():
+    from trading.backtest_harness.strategy_v0 import atr_hlc, ema, ema2_atr
+
+    rng = random.Random(5)
+    for _ in range(500):
+        n = rng.randint(0, 120)
+        closes = [rng.randint(400, 480) * 0.25 for _ in range(n)]
+        highs = [c + rng.randint(0, 8) * 0.25 for c in closes]
+        lows = [c - rng.randint(0, 8) * 0.25 for c in closes]
+        fast, slow, atr_len = rng.randint(0, 20), rng.randint(0, 50), rng.randint(0, 20)
+        want = (ema(closes, fast), ema(closes, slow), atr_hlc(highs, lows, closes, atr_len))
+        assert ema2_atr(highs, lows, closes, fast, slow, atr_len) == want
@@ -0,0 +1,38 @@
+from trading.backtest_harness import strategy_v8_orb_pullback as v8
+from trading.backtest_harness.param_batch import generate_trades_batch
+from trading.backtest_harness.synthetic import random_walk_candles
+
+
+def _candles():
+    return random_walk_candles(4, 2000)
+
+
+def test_batch_matches_individual_runs():
+    candles = _candles()
+    params = [v8.Params(regime=v8.Regime(atr_min_points=m)) for m in (2.0, 4.0, 6.0)]
+    want = [v8.generate_trades(candles, p) for p in params]
+    assert generate_trades_batch(v8.generate_trades, candles, params) == want
+    assert generate_trades_batch(v8.generate_trades, candles, params, workers=2) == want
+
+
+def test_exit_sweep_reuses_signals():
+    from dataclasses import replace
+
+    from trading.backtest_harness import strategy_v7_regime_switch as v7
+    from trading.backtest_harness import strategy_v9_open_snapback as v9
+    from trading.backtest_harness.tv_csv import candles_to_arrays
+
+    candles = _candles()
+    cols = candles_to_arrays(candles)
+    for mod, exit_field in ((v7, "exits_drive"), (v8, "exits"), (v9, "exits")):
+        base = mod.Params(regime=mod.Regime(atr_min_points=2.0))
+        params = []
+        for mult in (0.5, 1.0, 1.5):
+            p = replace(base, **{exit_field: replace(getattr(base, exit_field), stop_atr_mult=mult)})
+            params.append(replace(p, governor=replace(p.governor, max_trades_per_day=2)))
+        want = [mod.generate_trades(candles, p) for p in params]
+
+        sig = mod.precompute_signals(cols, base)
+        for p, trades in zip(params, want):
+            assert mod.precompute_signals(cols, p) is sig
+            assert mod.generate_trades(cols, p) == trades
@@ -0,0 +1,10 @@
+from trading.backtest_harness.sweep import sweep_daily_model
+
+
+def test_sweep_workers_match_serial():
+    # small grid: a pool is a concurrent run (SAFE_MODE.md), keep it brief
+    kw = dict(n=200, p_win_vals=[0.5, 0.6], win_vals=[200, 300], loss_vals=[-150, -250], seed=7)
+    want = sweep_daily_model(**kw)
+    assert len(want) == 8
+    assert sweep_daily_model(workers=2, **kw) == want
+    assert sweep_daily_model(workers=3, **kw) == want
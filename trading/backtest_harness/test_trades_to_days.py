@@ -0,0 +1,44 @@
+import random
+
+from trading.backtest_harness.strategy_v0 import Trade
+from trading.backtest_harness.trades_to_days import aggregate_daily, to_day_profits_and_closes, utc_day_key
+from trading.prop.lucid_black_25k.risk_governor import default_rules
+
+
+def _trades(rng, n):
+    out = []
+    for _ in range(n):
+        # exits land anywhere in a ~3 week span, unsorted, some right on a UTC midnight
+        ts = 1_700_006_400 + rng.choice([rng.randint(0, 21 * 86400), 86400 * rng.randint(0, 21), 86400 * rng.randint(1, 21) - 1])
+        pnl = rng.choice([0.0, rng.uniform(-300.0, 300.0), float(rng.randint(-40, 40)) * 12.5])
+        out.append(Trade(side=rng.choice(["long", "short"]), entry_ts=ts - 600, exit_ts=ts, entry=0.0, exit=0.0, sl=0.0, tp=0.0, pnl_dollars=pnl))
+    return out
+
+
+def test_aggregate_daily_matches_string_key_buckets():
+    rng = random.Random(11)
+    for _ in range(200):
+        trades = _trades(rng, rng.randint(0, 60))
+        want = {}
+        for t in trades:
+            k = utc_day_key(t.exit_ts)
+            want[k] = want.get(k, 0.0) + t.pnl_dollars
+        want = dict(sorted(want.items()))
+        assert list(aggregate_daily(trades).items()) == list(want.items())
+
+
+def test_day_profits_and_closes_match_running_balance_loop():
+    rng = random.Random(12)
+    rules = default_rules()
+    for _ in range(200):
+        trades = _trades(rng, rng.randint(0, 60))
+        daily = aggregate_daily(trades)
+        keys = list(daily)
+        profits = [daily[k] for k in keys]
+        closes = []
+        bal = rules.start_balance
+        for p in profits:
+            bal += p
+            closes.append(bal)
+        assert to_day_profits_and_closes(trades) == (profits, closes, keys)
+        assert to_day_profits_and_closes(trades, rules) == (profits, closes, keys)
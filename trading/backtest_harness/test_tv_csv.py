@@ -0,0 +1,111 @@
+import csv
+import random
+from datetime import datetime, timezone
+
+from trading.backtest_harness import tv_csv, tv_csv_multi
+from trading.backtest_harness.tv_csv import candles_to_arrays
+
+
+def _ref_ohlc(path):
+    """DictReader formulation of tv_csv.load_tradingview_ohlc_csv."""
+    with open(path, newline='') as f:
+        out = []
+        for row in csv.DictReader(f):
+            v = row.get('volume')
+            out.append(
+                tv_csv.Candle(
+                    int(float(row['time'])), float(row['open']), float(row['high']), float(row['low']), float(row['close']),
+                    float(v) if v not in (None, '', 'null') else None,
+                )
+            )
+    out.sort(key=lambda c: c.ts)
+    return out
+
+
+def _ref_multi(path):
+    """DictReader formulation of tv_csv_multi.load_tv_csv."""
+    with open(path, newline='') as f:
+        r = csv.DictReader(f)
+        cols = {c.lower(): c for c in r.fieldnames}
+        tcol = cols.get('time') or cols.get('timestamp') or cols.get('date')
+        out = [
+            tv_csv_multi.Candle(
+                tv_csv_multi._parse_time(row[tcol]),
+                float(row[cols.get('open', 'open')]),
+                float(row[cols.get('high', 'high')]),
+                float(row[cols.get('low', 'low')]),
+                float(row[cols.get('close', 'close')]),
+                float(row.get(cols.get('volume', 'volume'), 0) or 0),
+            )
+            for row in r
+        ]
+    out.sort(key=lambda c: c.ts)
+    return out
+
+
+def _write(path, header, rows, rng):
+    with open(path, 'w', newline='') as f:
+        f.write(','.join(header) + '\n')
+        for row in rows:
+            if rng.random() < 0.1:
+                f.write('\n')
+            f.write(','.join(row) + '\n')
+
+
+def _ohlc(rng):
+    o = 20000 + rng.randint(-400, 400) * 0.25
+    return [str(o), str(o + rng.randint(0, 20) * 0.25), str(o - rng.randint(0, 20) * 0.25), str(o + rng.randint(-20, 20) * 0.25)]
+
+
+def test_ohlc_loader_matches_dict_reader(tmp_path):
+    rng = random.Random(21)
+    for k in range(60):
+        with_volume = rng.random() < 0.7
+        header = ['time', 'open', 'high', 'low', 'close'] + (['volume'] if with_volume else [])
+        rows = []
+        for _ in range(rng.randint(0, 40)):
+            # few distinct timestamps, so ties exercise the stable sort
+            row = [rng.choice(['%d', '%d.0']) % (1_700_000_000 + 60 * rng.randint(0, 15))] + _ohlc(rng)
+            if with_volume:
+                v = rng.choice(['', 'null', str(rng.randint(0, 900)), None])
+                if v is not None:  # None: short row with the volume field left off
+                    row.append(v)
+            rows.append(row)
+        path = tmp_path / f'ohlc{k}.csv'
+        _write(path, header, rows, rng)
+        want = _ref_ohlc(path)
+        assert tv_csv.load_tradingview_ohlc_csv(path) == want
+        assert tv_csv.load_tradingview_ohlc_arrays(path) == candles_to_arrays(want)
+    empty = tmp_path / 'empty.csv'
+    empty.write_text('')
+    assert tv_csv.load_tradingview_ohlc_csv(empty) == []
+    assert tv_csv.load_tradingview_ohlc_arrays(empty) == candles_to_arrays([])
+
+
+def test_multi_loader_matches_dict_reader(tmp_path):
+    rng = random.Random(22)
+    for k in range(60):
+        with_volume = rng.random() < 0.7
+        tcol = rng.choice(['time', 'Time', 'timestamp', 'date'])
+        header = [tcol, 'open', 'high', 'low', 'close'] + (['Volume' if rng.random() < 0.5 else 'volume'] if with_volume else [])
+        rows, stamps = [], []
+        for _ in range(rng.randint(1, 40)):
+            ts = 1_770_300_000 + 60 * rng.randint(0, 15)
+            stamps.append(ts)
+            dt = datetime.fromtimestamp(ts, tz=timezone.utc)
+            # naive times only as %m/%d/%Y: fromisoformat would read a naive ISO string as local time
+            t = rng.choice(
+                [str(ts), str(ts * 1000), dt.strftime('%Y-%m-%dT%H:%M:%SZ'), dt.isoformat(), dt.strftime('%m/%d/%Y %H:%M:%S')]
+            )
+            row = [t] + _ohlc(rng)
+            if with_volume:
+                v = rng.choice(['', str(rng.randint(0, 900)), None])
+                if v is not None:
+                    row.append(v)
+            rows.append(row)
+        path = tmp_path / f'multi{k}.csv'
+        _write(path, header, rows, rng)
+        want = _ref_multi(str(path))
+        assert [c.ts for c in want] == sorted(stamps)
+        assert tv_csv_multi.load_tv_csv(str(path)) == want
+        assert tv_csv_multi.load_tv_csv_arrays(str(path)) == candles_to_arrays(want)
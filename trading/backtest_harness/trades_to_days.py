@@ -13,12 +13,15 @@ This is fine for initial testing; we can later switch to CME session boundaries.
 
 from __future__ import annotations
 
+from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Dict, List, Tuple
+from itertools import accumulate
+from typing import DefaultDict, Dict, List, Tuple
 
+from trading.backtest_harness.bar_time import SECONDS_PER_DAY
 from trading.backtest_harness.strategy_v0 import Trade
-from trading.prop.lucid_black_25k.risk_governor import Lucid25kRules
+from trading.prop.lucid_black_25k.risk_governor import Lucid25kRules, default_rules
 
 
 def utc_day_key(ts: int) -> str:
@@ -27,23 +30,20 @@ def utc_day_key(ts: int) -> str:
 
 
 def aggregate_daily(trades: List[Trade]) -> Dict[str, float]:
-    by: Dict[str, float] = {}
+    # bucket by integer UTC day id; format 'YYYY-MM-DD' once per day, not per trade
+    by: DefaultDict[int, float] = defaultdict(float)
     for t in trades:
-        k = utc_day_key(t.exit_ts)
-        by[k] = by.get(k, 0.0) + t.pnl_dollars
-    return dict(sorted(by.items()))
+        by[t.exit_ts // SECONDS_PER_DAY] += t.pnl_dollars
+    return {utc_day_key(d * SECONDS_PER_DAY): pnl for d, pnl in sorted(by.items())}
 
 
 def to_day_profits_and_closes(trades: List[Trade], rules: Lucid25kRules | None = None) -> Tuple[List[float], List[float], List[str]]:
-    rules = rules or Lucid25kRules()
+    rules = rules or default_rules()
     daily = aggregate_daily(trades)
     keys = list(daily.keys())
-    profits = [daily[k] for k in keys]
+    profits = list(daily.values())
 
-    closes: List[float] = []
-    bal = rules.start_balance
-    for p in profits:
-        bal += p
-        closes.append(bal)
+    # running balance: start_balance + p0, + p1, ... (same left-to-right sums as a loop)
+    closes = list(accumulate(profits, initial=rules.start_balance))[1:]
 
     return profits, closes, keys
@@ -8,17 +8,20 @@ Expected columns (as seen in MNQ export):
 Optional: volume
 
 We normalize into a list of Candle objects, sorted by timestamp.
+Column-wise consumers (indicators, bar loops) can take a CandleArrays view instead.
 """
 
 from __future__ import annotations
 
+from collections import Counter
 from dataclasses import dataclass
+from operator import itemgetter, sub
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 import csv
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Candle:
     ts: int  # unix seconds
     open: float
@@ -28,29 +31,105 @@ class Candle:
     volume: Optional[float] = None
 
 
-def load_tradingview_ohlc_csv(path: str | Path) -> List[Candle]:
+@dataclass(frozen=True)
+class CandleArrays:
+    """Same series as List[Candle], stored as one list per column.
+
+    Indexing (arr[i], arr[a:b], iteration) builds Candle rows on demand, so code
+    written against List[Candle] still runs on it, just without the column speedup.
+    """
+    ts: List[int]
+    open: List[float]
+    high: List[float]
+    low: List[float]
+    close: List[float]
+    volume: Optional[List[Optional[float]]] = None
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def __getitem__(self, i: Union[int, slice]) -> Union[Candle, List[Candle]]:
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self.ts)))]
+        v = self.volume[i] if self.volume is not None else None
+        return Candle(self.ts[i], self.open[i], self.high[i], self.low[i], self.close[i], v)
+
+    def __iter__(self) -> Iterator[Candle]:
+        for i in range(len(self.ts)):
+            yield self[i]
+
+    def window(self, start: int, stop: int) -> CandleArrays:
+        """Bars [start, stop) as CandleArrays (column slices, no Candle rows)."""
+        v = self.volume[start:stop] if self.volume is not None else None
+        return CandleArrays(
+            self.ts[start:stop], self.open[start:stop], self.high[start:stop], self.low[start:stop], self.close[start:stop], v
+        )
+
+
+def candles_to_arrays(candles: Sequence[Candle]) -> CandleArrays:
+    return CandleArrays(
+        ts=[c.ts for c in candles],
+        open=[c.open for c in candles],
+        high=[c.high for c in candles],
+        low=[c.low for c in candles],
+        close=[c.close for c in candles],
+        volume=[c.volume for c in candles],
+    )
+
+
+def _read_ohlc_rows(path: str | Path) -> List[Tuple[int, float, float, float, float, Optional[float]]]:
+    """(ts, open, high, low, close, volume) per data row, sorted by ts (stable)."""
     p = Path(path)
+    rows: List[Tuple[int, float, float, float, float, Optional[float]]] = []
     with p.open('r', newline='') as f:
-        r = csv.DictReader(f)
-        candles: List[Candle] = []
+        r = csv.reader(f)
+        header = next(r, None)
+        if header is None:
+            return rows
+        # column positions by header name; on duplicates the last one wins, as with DictReader
+        idx = {name: i for i, name in enumerate(header)}
+        t_i = idx['time']
+        o_i = idx['open']
+        h_i = idx['high']
+        l_i = idx['low']
+        c_i = idx['close']
+        v_i = idx.get('volume')
         for row in r:
-            ts = int(float(row['time']))
-            o = float(row['open'])
-            h = float(row['high'])
-            l = float(row['low'])
-            c = float(row['close'])
-            v = row.get('volume')
-            candles.append(Candle(ts=ts, open=o, high=h, low=l, close=c, volume=float(v) if v not in (None, '', 'null') else None))
+            if not row:
+                continue  # blank line (DictReader skipped these too)
+            ts = int(float(row[t_i]))
+            o = float(row[o_i])
+            h = float(row[h_i])
+            l = float(row[l_i])
+            c = float(row[c_i])
+            v = row[v_i] if v_i is not None and v_i < len(row) else None
+            rows.append((ts, o, h, l, c, float(v) if v not in (None, '', 'null') else None))
+
+    rows.sort(key=itemgetter(0))
+    return rows
+
+
+def rows_to_arrays(rows: Sequence[Sequence]) -> CandleArrays:
+    """CandleArrays from (ts, open, high, low, close, ...) rows, without building Candle objects."""
+    if not rows:
+        return CandleArrays([], [], [], [], [], [])
+    cols = list(zip(*rows))
+    volume = list(cols[5]) if len(cols) > 5 else None
+    return CandleArrays(list(cols[0]), list(cols[1]), list(cols[2]), list(cols[3]), list(cols[4]), volume)
+
+
+def load_tradingview_ohlc_csv(path: str | Path) -> List[Candle]:
+    return [Candle(*row) for row in _read_ohlc_rows(path)]
+
 
-    candles.sort(key=lambda x: x.ts)
-    return candles
+def load_tradingview_ohlc_arrays(path: str | Path) -> CandleArrays:
+    return rows_to_arrays(_read_ohlc_rows(path))
 
 
-def infer_bar_seconds(candles: List[Candle]) -> int:
+def infer_bar_seconds(candles: Union[List[Candle], CandleArrays]) -> int:
     if len(candles) < 2:
         return 0
-    # Most common delta
-    from collections import Counter
-    deltas = [candles[i].ts - candles[i-1].ts for i in range(1, min(len(candles), 2000))]
-    d = Counter(deltas).most_common(1)[0][0]
+    # Most common delta over the first 2000 bars
+    ts = candles.ts[:2000] if isinstance(candles, CandleArrays) else [c.ts for c in candles[:2000]]
+    d = Counter(map(sub, ts[1:], ts[:-1])).most_common(1)[0][0]
     return int(d)
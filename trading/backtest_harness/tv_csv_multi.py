@@ -16,10 +16,13 @@ from __future__ import annotations
 import csv
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import List
+from operator import itemgetter
+from typing import List, Tuple
 
+from trading.backtest_harness.tv_csv import CandleArrays, rows_to_arrays
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class Candle:
     ts: int
     open: float
@@ -38,7 +41,12 @@ def _parse_time(s: str) -> int:
             return v // 1000
         return v
     # try ISO formats
-    # TradingView often uses: 2026-02-05T14:30:00Z
+    # TradingView often uses: 2026-02-05T14:30:00Z. fromisoformat takes the Z suffix
+    # directly on 3.11+, so only pay for the replace() when it doesn't.
+    try:
+        return int(datetime.fromisoformat(s).timestamp())
+    except Exception:
+        pass
     try:
         dt = datetime.fromisoformat(s.replace('Z', '+00:00'))
         return int(dt.timestamp())
@@ -54,26 +62,47 @@ def _parse_time(s: str) -> int:
     raise ValueError(f"Unrecognized time value: {s}")
 
 
-def load_tv_csv(path: str) -> List[Candle]:
-    out: List[Candle] = []
+def _read_rows(path: str) -> List[Tuple[int, float, float, float, float, float]]:
+    """(ts, open, high, low, close, volume) per data row, sorted by ts (stable)."""
+    rows: List[Tuple[int, float, float, float, float, float]] = []
     with open(path, newline='') as f:
-        r = csv.DictReader(f)
-        cols = {c.lower(): c for c in (r.fieldnames or [])}
+        r = csv.reader(f)
+        header = next(r, None)
+        # column positions by header name; on duplicates the last one wins, as with DictReader
+        idx = {c: i for i, c in enumerate(header or [])}
+        cols = {c.lower(): c for c in (header or [])}
         # flexible headers
         tcol = cols.get('time') or cols.get('timestamp') or cols.get('date')
         if not tcol:
-            raise ValueError(f"No time column found in {path}: {r.fieldnames}")
+            raise ValueError(f"No time column found in {path}: {header}")
+        t_i = idx[tcol]
+        o_i = idx[cols.get('open', 'open')]
+        h_i = idx[cols.get('high', 'high')]
+        l_i = idx[cols.get('low', 'low')]
+        c_i = idx[cols.get('close', 'close')]
+        v_i = idx.get(cols.get('volume', 'volume'))
         for row in r:
-            ts = _parse_time(row[tcol])
-            out.append(
-                Candle(
-                    ts=ts,
-                    open=float(row[cols.get('open','open')]),
-                    high=float(row[cols.get('high','high')]),
-                    low=float(row[cols.get('low','low')]),
-                    close=float(row[cols.get('close','close')]),
-                    volume=float(row.get(cols.get('volume','volume'), 0) or 0),
+            if not row:
+                continue  # blank line (DictReader skipped these too)
+            v = row[v_i] if v_i is not None and v_i < len(row) else None
+            rows.append(
+                (
+                    _parse_time(row[t_i]),
+                    float(row[o_i]),
+                    float(row[h_i]),
+                    float(row[l_i]),
+                    float(row[c_i]),
+                    float(v or 0),
                 )
             )
-    out.sort(key=lambda c: c.ts)
-    return out
+    rows.sort(key=itemgetter(0))
+    return rows
+
+
+def load_tv_csv(path: str) -> List[Candle]:
+    return [Candle(*row) for row in _read_rows(path)]
+
+
+def load_tv_csv_arrays(path: str) -> CandleArrays:
+    """Same series as load_tv_csv, as columns, without building Candle objects."""
+    return rows_to_arrays(_read_rows(path))
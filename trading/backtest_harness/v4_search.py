@@ -17,18 +17,19 @@ _REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")
 if _REPO_ROOT not in sys.path:
     sys.path.insert(0, _REPO_ROOT)
 
-import json
 import random
 import time
 
 from trading.backtest_harness.tv_csv_multi import load_tv_csv
 from trading.backtest_harness.days_to_pass_multi import days_to_pass_distribution_multi
+from trading.backtest_harness.search_ckpt import CheckpointThrottle, RunCaps, SeenCfgs, write_json_atomic
 from trading.backtest_harness.strategy_v4_retest import Params, Session, Governor, Regime, Entry, Exits, generate_trades
 
 
 def pass5_rate(out: dict) -> float:
     w = out["windows"]
-    p5 = sum(v for d, v in out["pass_days_hist"].items() if int(d) <= 5)
+    # hist keys are int days (days_to_pass_multi keys its dict by res.days)
+    p5 = sum(v for d, v in out["pass_days_hist"].items() if d <= 5)
     return p5 / w if w else 0.0
 
 
@@ -72,7 +73,31 @@ def main():
 
     best = None
     n = 0
-    t0 = time.time()
+    t0 = time.monotonic()
+    ckpt_due = CheckpointThrottle()
+    caps = RunCaps.from_env()
+
+    last = None  # cand of the latest cfg that met the constraint
+
+    def write_ckpt() -> None:
+        score, p5, mll, timeout, cfg, out = last
+        write_json_atomic(
+            out_ckpt,
+            {
+                "updatedAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "iterations": n,
+                "elapsed_s": round(time.monotonic() - t0, 1),
+                "current": {
+                    "score": score,
+                    "pass5_rate": p5,
+                    "mll_rate": mll,
+                    "timeout_rate": timeout,
+                    "cfg": cfg,
+                    "outcomes": out["outcomes"],
+                },
+            },
+            separators=(",", ":"),
+        )
 
     def pick():
         c = {k: random.choice(v) for k, v in space.items()}
@@ -80,9 +105,14 @@ def main():
             c["ema_fast"], c["ema_slow"] = min(c["ema_fast"], c["ema_slow"]), max(c["ema_fast"], c["ema_slow"])
         return c
 
-    while True:
-        n += 1
+    seen = SeenCfgs()
+    while not caps.reached(n):
         cfg = pick()
+        if not seen.add(tuple(cfg.values())):
+            if seen.exhausted:
+                break
+            continue
+        n += 1
 
         p = Params(
             risk_per_trade_dollars=float(cfg["risk"]),
@@ -141,53 +171,39 @@ def main():
         score = (p5, -timeout)
         cand = (score, p5, mll, timeout, cfg, out)
 
-        # checkpoint current
-        with open(out_ckpt, "w") as f:
-            json.dump(
+        # checkpoint current (throttled; the best file below is still written on every new best)
+        last = cand
+        if ckpt_due.due(n):
+            write_ckpt()
+
+        if best is None or cand[0] > best[0]:
+            best = cand
+            write_json_atomic(
+                out_best,
                 {
                     "updatedAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
                     "iterations": n,
-                    "elapsed_s": round(time.time() - t0, 1),
-                    "current": {
-                        "score": score,
-                        "pass5_rate": p5,
-                        "mll_rate": mll,
-                        "timeout_rate": timeout,
-                        "cfg": cfg,
-                        "outcomes": out["outcomes"],
-                        "pass_days_hist": out["pass_days_hist"],
-                    },
+                    "elapsed_s": round(time.monotonic() - t0, 1),
+                    "score": best[0],
+                    "pass5_rate": best[1],
+                    "mll_rate": best[2],
+                    "timeout_rate": best[3],
+                    "cfg": best[4],
+                    "outcomes": best[5]["outcomes"],
+                    "pass_days_hist": best[5]["pass_days_hist"],
                 },
-                f,
                 indent=2,
             )
 
-        if best is None or cand[0] > best[0]:
-            best = cand
-            with open(out_best, "w") as f:
-                json.dump(
-                    {
-                        "updatedAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-                        "iterations": n,
-                        "elapsed_s": round(time.time() - t0, 1),
-                        "score": best[0],
-                        "pass5_rate": best[1],
-                        "mll_rate": best[2],
-                        "timeout_rate": best[3],
-                        "cfg": best[4],
-                        "outcomes": best[5]["outcomes"],
-                        "pass_days_hist": best[5]["pass_days_hist"],
-                    },
-                    f,
-                    indent=2,
-                )
-
         if n % 10 == 0 and best is not None:
             print(
                 f"n={n} current p5={p5:.3f} mll={mll:.3f} to={timeout:.3f} | best p5={best[1]:.3f} mll={best[2]:.3f}",
                 flush=True,
             )
 
+    if last is not None:
+        write_ckpt()
+
 
 if __name__ == "__main__":
     main()
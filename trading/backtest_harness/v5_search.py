@@ -13,7 +13,6 @@ Run from repo root or anywhere.
 
 from __future__ import annotations
 
-import json
 import os
 import random
 import sys
@@ -23,19 +22,21 @@ _REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")
 if _REPO_ROOT not in sys.path:
     sys.path.insert(0, _REPO_ROOT)
 
-from trading.backtest_harness.tv_csv import load_tradingview_ohlc_csv
+from trading.backtest_harness.tv_csv import load_tradingview_ohlc_arrays
 from trading.backtest_harness.days_to_pass import days_to_pass_distribution
+from trading.backtest_harness.search_ckpt import CheckpointThrottle, RunCaps, SeenCfgs, write_json_atomic
 from trading.backtest_harness.strategy_v5_regime_drive import Params, Window, Regime, Entry, Exits, Governor, generate_trades
 
 
 def pass5_rate(out: dict) -> float:
     w = out["windows"]
-    p5 = sum(v for d, v in out["pass_days_hist"].items() if int(d) <= 5)
+    # hist keys are ints (days_to_pass builds it from a Counter)
+    p5 = sum(v for d, v in out["pass_days_hist"].items() if d <= 5)
     return p5 / w if w else 0.0
 
 
 def main():
-    candles = load_tradingview_ohlc_csv("trading/data/inbound/mnq1_5m_tv_unix.csv")
+    candles = load_tradingview_ohlc_arrays("trading/data/inbound/mnq1_5m_tv_unix.csv")
 
     # Trading window 7:30am–10pm ET (12:30–03:00 UTC) implemented as 2 windows
     windows = (
@@ -66,11 +67,48 @@ def main():
 
     best = None
     n = 0
-    t0 = time.time()
+    t0 = time.monotonic()
+    ckpt_due = CheckpointThrottle()
+    caps = RunCaps.from_env()
+
+    last = None  # (cfg, p5, mll, timeout, out, ok) of the latest scored cfg
+
+    def write_ckpt() -> None:
+        cfg, p5, mll, timeout, out, ok = last
+        write_json_atomic(
+            out_ckpt,
+            {
+                "updatedAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "iterations": n,
+                "elapsed_s": round(time.monotonic() - t0, 1),
+                "ok": ok,
+                "current": {
+                    "pass5_rate": p5,
+                    "mll_rate": mll,
+                    "timeout_rate": timeout,
+                    "cfg": cfg,
+                    "outcomes": out["outcomes"],
+                },
+                "best": {
+                    "pass5_rate": (best[1] if best else None),
+                    "mll_rate": (best[2] if best else None),
+                },
+            },
+            separators=(",", ":"),
+        )
 
-    while True:
+    seen = SeenCfgs()
+    # (key, values) pairs and the bound choice looked up once; still one random.choice per
+    # key in space order, so a given RNG state draws the same cfgs as before
+    axes = tuple((k, tuple(v)) for k, v in space.items())
+    choice = random.choice
+    while not caps.reached(n):
+        cfg = {k: choice(v) for k, v in axes}
+        if not seen.add(tuple(cfg.values())):
+            if seen.exhausted:
+                break
+            continue
         n += 1
-        cfg = {k: random.choice(v) for k, v in space.items()}
 
         p = Params(
             risk_per_trade_dollars=float(cfg["risk"]),
@@ -112,30 +150,10 @@ def main():
         # hard constraint: fail <= 5%
         ok = (mll <= 0.05)
 
-        # checkpoint every iteration
-        with open(out_ckpt, "w") as f:
-            json.dump(
-                {
-                    "updatedAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-                    "iterations": n,
-                    "elapsed_s": round(time.time() - t0, 1),
-                    "ok": ok,
-                    "current": {
-                        "pass5_rate": p5,
-                        "mll_rate": mll,
-                        "timeout_rate": timeout,
-                        "cfg": cfg,
-                        "outcomes": out["outcomes"],
-                        "pass_days_hist": out["pass_days_hist"],
-                    },
-                    "best": {
-                        "pass5_rate": (best[1] if best else None),
-                        "mll_rate": (best[2] if best else None),
-                    },
-                },
-                f,
-                indent=2,
-            )
+        # checkpoint current (throttled; the best file below is still written on every new best)
+        last = (cfg, p5, mll, timeout, out, ok)
+        if ckpt_due.due(n):
+            write_ckpt()
 
         if not ok:
             continue
@@ -145,23 +163,22 @@ def main():
 
         if best is None or cand[0] > best[0]:
             best = cand
-            with open(out_best, "w") as f:
-                json.dump(
-                    {
-                        "updatedAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-                        "iterations": n,
-                        "elapsed_s": round(time.time() - t0, 1),
-                        "score": best[0],
-                        "pass5_rate": best[1],
-                        "mll_rate": best[2],
-                        "timeout_rate": best[3],
-                        "cfg": best[4],
-                        "outcomes": best[5]["outcomes"],
-                        "pass_days_hist": best[5]["pass_days_hist"],
-                    },
-                    f,
-                    indent=2,
-                )
+            write_json_atomic(
+                out_best,
+                {
+                    "updatedAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                    "iterations": n,
+                    "elapsed_s": round(time.monotonic() - t0, 1),
+                    "score": best[0],
+                    "pass5_rate": best[1],
+                    "mll_rate": best[2],
+                    "timeout_rate": best[3],
+                    "cfg": best[4],
+                    "outcomes": best[5]["outcomes"],
+                    "pass_days_hist": best[5]["pass_days_hist"],
+                },
+                indent=2,
+            )
 
         if n % 50 == 0 and best is not None:
             print(
@@ -169,6 +186,9 @@ def main():
                 flush=True,
             )
 
+    if last is not None:
+        write_ckpt()
+
 
 if __name__ == "__main__":
     main()
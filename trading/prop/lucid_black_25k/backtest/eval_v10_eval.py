@@ -21,12 +21,14 @@ No external deps.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import date, datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from collections import Counter, defaultdict
+from dataclasses import dataclass, replace
+from datetime import date
+from typing import DefaultDict, Dict, List, Optional, Tuple, Union
 
+from trading.backtest_harness.bar_time import SECONDS_PER_DAY
 from trading.backtest_harness.strategy_v9_open_snapback import Params, Regime, Snapback, Exits, Governor, generate_trades
-from trading.backtest_harness.tv_csv import Candle
+from trading.backtest_harness.tv_csv import Candle, CandleArrays, candles_to_arrays
 
 
 @dataclass(frozen=True)
@@ -42,84 +44,83 @@ class Eval25kSpec:
     locked_mll_balance: float = 25100.0
 
 
-def _day_key_utc(ts: int) -> str:
-    return datetime.utcfromtimestamp(ts).strftime("%Y-%m-%d")
-
-
-def _parse_day_key(s: str) -> date:
-    y, m, d = s.split("-")
-    return date(int(y), int(m), int(d))
-
-
-def _is_weekday(d: date) -> bool:
-    return d.weekday() < 5
-
-
-def _iter_bdays(start: date, end: date) -> List[date]:
-    out: List[date] = []
-    cur = start
-    while cur <= end:
-        if _is_weekday(cur):
-            out.append(cur)
-        cur += timedelta(days=1)
-    return out
-
-
-def compute_day_pnl_for_sessions(candles: List[Candle], params: dict, sessions_utc: List[Tuple[int, int]]) -> Dict[str, float]:
-    """Aggregate realized PnL by UTC date key across multiple disjoint sessions."""
-
-    agg: Dict[str, float] = {}
-
+# day ids count UTC days from 1970-01-01, which was a Thursday
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def _is_weekday(day_id: int) -> bool:
+    return (day_id + 3) % 7 < 5
+
+
+def _day_key(day_id: int) -> str:
+    return date.fromordinal(_EPOCH_ORDINAL + day_id).isoformat()
+
+
+def _params_from_cfg(params: dict) -> Params:
+    """v9 Params for a search cfg dict; the open window is left for the caller to set."""
+    return Params(
+        risk_per_trade_dollars=float(params["risk"]),
+        max_micros=int(params.get("max_micros", 20)),
+        regime=Regime(atr_min_points=float(params["atr_min"])),
+        snap=Snapback(
+            dev_atr_mult=float(params["dev"]),
+            require_reversal_bar=bool(params.get("require_reversal_bar", True)),
+            use_spread_filter=bool(params.get("use_spread", False)),
+            max_spread_points=float(params.get("max_spread", 2.0)),
+        ),
+        exits=Exits(
+            stop_atr_mult=float(params["stop"]),
+            trail_atr_mult=float(params["trail"]),
+            tp_atr_mult=float(params["tp"]),
+            max_hold_bars=int(params["hold"]),
+        ),
+        governor=Governor(
+            max_trades_per_day=int(params["mt"]),
+            max_losses_per_day=int(params.get("ml", 99)),
+            daily_loss_stop=float(params.get("dls", 1e9)),
+            cooldown_bars_after_loss=int(params.get("cool", 0)),
+            daily_profit_target_base=float(params.get("dpt_base", 1e9)),
+            daily_profit_target_press=float(params.get("dpt_press", 1e9)),
+            stop_after_first_loss=bool(params.get("stop1", False)),
+        ),
+    )
+
+
+def compute_day_pnl_for_sessions(
+    candles: Union[List[Candle], CandleArrays], params: dict, sessions_utc: List[Tuple[int, int]]
+) -> Dict[str, float]:
+    """Aggregate realized PnL by UTC date key across multiple disjoint sessions.
+
+    Pass CandleArrays when calling this in a search loop: v9 then reuses its
+    EMA/ATR columns across sessions and across calls instead of rebuilding them.
+    """
+    cols = candles if isinstance(candles, CandleArrays) else candles_to_arrays(candles)
+
+    # bucket by integer UTC day id; format 'YYYY-MM-DD' once per day, not per trade
+    by_day: DefaultDict[int, float] = defaultdict(float)
+
+    # everything but the open window is shared across sessions; build it once
+    base = _params_from_cfg(params)
     for os, oe in sessions_utc:
-        p = Params(
-            open_start_min_utc=int(os),
-            open_end_min_utc=int(oe),
-            risk_per_trade_dollars=float(params["risk"]),
-            max_micros=int(params.get("max_micros", 20)),
-            regime=Regime(atr_min_points=float(params["atr_min"])),
-            snap=Snapback(
-                dev_atr_mult=float(params["dev"]),
-                require_reversal_bar=bool(params.get("require_reversal_bar", True)),
-                use_spread_filter=bool(params.get("use_spread", False)),
-                max_spread_points=float(params.get("max_spread", 2.0)),
-            ),
-            exits=Exits(
-                stop_atr_mult=float(params["stop"]),
-                trail_atr_mult=float(params["trail"]),
-                tp_atr_mult=float(params["tp"]),
-                max_hold_bars=int(params["hold"]),
-            ),
-            governor=Governor(
-                max_trades_per_day=int(params["mt"]),
-                max_losses_per_day=int(params.get("ml", 99)),
-                daily_loss_stop=float(params.get("dls", 1e9)),
-                cooldown_bars_after_loss=int(params.get("cool", 0)),
-                daily_profit_target_base=float(params.get("dpt_base", 1e9)),
-                daily_profit_target_press=float(params.get("dpt_press", 1e9)),
-                stop_after_first_loss=bool(params.get("stop1", False)),
-            ),
-        )
-
-        trades = generate_trades(candles, p)
+        p = replace(base, open_start_min_utc=int(os), open_end_min_utc=int(oe))
+
+        trades = generate_trades(cols, p)
         for t in trades:
-            dk = _day_key_utc(t.exit_ts)
-            agg[dk] = agg.get(dk, 0.0) + float(t.pnl_dollars)
+            by_day[t.exit_ts // SECONDS_PER_DAY] += float(t.pnl_dollars)
 
     # Fill missing business days with 0
-    if not agg:
+    if not by_day:
         return {}
 
-    keys = sorted(agg.keys())
-    start = _parse_day_key(keys[0])
-    end = _parse_day_key(keys[-1])
-    for d in _iter_bdays(start, end):
-        dk = d.strftime("%Y-%m-%d")
-        agg.setdefault(dk, 0.0)
+    for d in range(min(by_day), max(by_day) + 1):
+        if _is_weekday(d):
+            by_day.setdefault(d, 0.0)
 
-    return dict(sorted(agg.items()))
+    return {_day_key(d): pnl for d, pnl in sorted(by_day.items())}
 
 
-def _eval_cycle(day_keys: List[str], day_pnl: Dict[str, float], start_i: int, max_days: int, spec: Eval25kSpec) -> Tuple[bool, Optional[int], bool]:
+def _eval_cycle(pnls: List[float], start_i: int, max_days: int, spec: Eval25kSpec) -> Tuple[bool, Optional[int], bool]:
+    """One eval attempt over pnls[start_i : start_i + max_days] -> (passed, days, breached)."""
     total = 0.0
     largest = float("-inf")
 
@@ -127,14 +128,10 @@ def _eval_cycle(day_keys: List[str], day_pnl: Dict[str, float], start_i: int, ma
     high_close = close_bal
     mll = high_close - spec.max_loss_limit
 
-    for k in range(max_days):
-        i = start_i + k
-        if i >= len(day_keys):
-            break
-
-        dk = day_keys[i]
-        pnl = float(day_pnl.get(dk, 0.0))
-
+    # No early "can't pass any more" exit: stopping is only exact if a breach is also out
+    # of reach (remaining loss days < cushion), which needs prefix sums and a check per day.
+    # Tried it; windows are max_scan_days (5-15) long, so it measured ~10% slower.
+    for k, pnl in enumerate(pnls[start_i : start_i + max_days]):
         total += pnl
         largest = max(largest, pnl)
 
@@ -159,18 +156,16 @@ def _eval_cycle(day_keys: List[str], day_pnl: Dict[str, float], start_i: int, ma
 def score_eval_pass(day_pnl_by_date: Dict[str, float], horizons=(4, 5, 7, 10), max_scan_days: int = 15) -> dict:
     spec = Eval25kSpec()
 
-    day_keys = list(day_pnl_by_date.keys())
+    # day PnL in date order, read by position instead of per-day key lookups
+    pnls = [float(v) for v in day_pnl_by_date.values()]
     totals = 0
     breaches = 0
     timeouts = 0
-    pass_counts = {h: 0 for h in horizons}
-
-    for start_i in range(0, len(day_keys)):
-        if start_i + max_scan_days >= len(day_keys):
-            break
+    pass_days: Counter = Counter()
 
+    for start_i in range(0, len(pnls) - max_scan_days):
         totals += 1
-        passed, days, breached = _eval_cycle(day_keys, day_pnl_by_date, start_i, max_scan_days, spec)
+        passed, days, breached = _eval_cycle(pnls, start_i, max_scan_days, spec)
         if breached:
             breaches += 1
             continue
@@ -178,9 +173,9 @@ def score_eval_pass(day_pnl_by_date: Dict[str, float], horizons=(4, 5, 7, 10), m
             timeouts += 1
             continue
         assert days is not None
-        for h in horizons:
-            if days <= h:
-                pass_counts[h] += 1
+        pass_days[days] += 1
+
+    pass_counts = {h: sum(n for d, n in pass_days.items() if d <= h) for h in horizons}
 
     def rate(n: int, d: int) -> float:
         return (n / d) if d else 0.0
@@ -3,6 +3,8 @@
 Reads:
 - DATA_CSV: path to TradingView CSV
 - MAX_SECONDS: time budget
+- SEED: order in which the (fully enumerated) search space is visited
+- WORKERS: processes scoring cfgs (default 1 = in-process; 0 = one per CPU)
 
 Writes:
 - artifacts/eval_v10_best.json
@@ -12,26 +14,102 @@ No external deps.
 
 from __future__ import annotations
 
+import itertools
 import json
+import multiprocessing
 import os
 import random
 import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from operator import itemgetter
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
 
-from trading.backtest_harness.tv_csv import load_tradingview_ohlc_csv
+from trading.backtest_harness.tv_csv import CandleArrays, load_tradingview_ohlc_arrays
 from trading.prop.lucid_black_25k.backtest.eval_v10_eval import compute_day_pnl_for_sessions, score_eval_pass
 
 
 SPLIT_WINDOWS_UTC = [(14 * 60 + 30, 15 * 60 + 15), (15 * 60 + 45, 17 * 60)]
 
+# cfg keys v9's entry signals depend on (the rest only change exits/governor/sizing)
+ENTRY_KEYS = ("dev", "atr_min")
+# shuffled cfgs are regrouped by ENTRY_KEYS within consecutive runs of this many
+ENTRY_BLOCK = 240
+_entry_of = itemgetter(*ENTRY_KEYS)
+
+# Set once per process (main, or each pool worker via initializer) so only cfgs cross
+# the process boundary, and v9's indicator memo stays warm for the whole search.
+_candles: Optional[CandleArrays] = None
+
+
+def _init_worker(candles: CandleArrays) -> None:
+    global _candles
+    _candles = candles
+
+
+def _eval_cfg(p: dict) -> dict:
+    return score_eval_pass(compute_day_pnl_for_sessions(_candles, p, SPLIT_WINDOWS_UTC))
+
+
+def _eval_group(cfgs: List[dict]) -> List[dict]:
+    return [_eval_cfg(p) for p in cfgs]
+
+
+def _scored(
+    ex: Optional[ProcessPoolExecutor], cfgs: Iterator[dict], workers: int, deadline: float
+) -> Iterator[Tuple[dict, dict]]:
+    """(cfg, metrics) in visit order, until cfgs run out or time.monotonic() passes deadline.
+
+    With a pool, each run of cfgs sharing entry params is one task, so the whole run lands
+    on one worker and its signals memo hits after the first cfg. At most 2 * workers tasks
+    are in flight and none is submitted past the deadline (queued ones are cancelled), so
+    a run overshoots MAX_SECONDS by about one entry group per worker.
+    """
+    if ex is None:
+        for p in cfgs:
+            if time.monotonic() >= deadline:
+                return
+            yield p, _eval_cfg(p)
+        return
+    groups = (list(g) for _, g in itertools.groupby(cfgs, key=_entry_of))
+    inflight: Deque[Tuple[List[dict], Future]] = deque()
+    while True:
+        while len(inflight) < 2 * workers and time.monotonic() < deadline:
+            g = next(groups, None)
+            if g is None:
+                break
+            inflight.append((g, ex.submit(_eval_group, g)))
+        if not inflight:
+            return
+        g, fut = inflight.popleft()
+        if time.monotonic() >= deadline and fut.cancel():
+            continue
+        yield from zip(g, fut.result())
+
+
+def _cfg_order(space: Dict[str, list], seed: int) -> List[tuple]:
+    """Every cfg in space (values in space's key order), in the order main() visits them."""
+    keys = tuple(space)
+    order = list(itertools.product(*space.values()))
+    random.Random(seed).shuffle(order)
+    # Within each block of ENTRY_BLOCK consecutive shuffled cfgs, those sharing entry params
+    # run back to back so v9's signals memo (8 entries; 2 per cfg, one per session) hits.
+    # Only the order inside a block changes (stable sort: SEED order within a group), so
+    # each completed block scores the same cfgs as the plain shuffle would.
+    by_entry = itemgetter(*(keys.index(k) for k in ENTRY_KEYS))
+    for i in range(0, len(order), ENTRY_BLOCK):
+        order[i : i + ENTRY_BLOCK] = sorted(order[i : i + ENTRY_BLOCK], key=by_entry)
+    return order
+
 
 def main() -> None:
     data_csv = os.environ.get("DATA_CSV", "trading/data/inbound/mnq1_5m_tv_unix.csv")
     max_seconds = float(os.environ.get("MAX_SECONDS", "1500"))
     seed = int(os.environ.get("SEED", "777"))
+    workers = int(os.environ.get("WORKERS", "1")) or os.cpu_count() or 1
 
-    random.seed(seed)
-
-    candles = load_tradingview_ohlc_csv(data_csv)
+    # columns, loaded once: every iteration reuses v9's indicator memo for this series
+    candles = load_tradingview_ohlc_arrays(data_csv)
 
     # Base params (eval rules: no DLL, but keep governor fields inert)
     base = {
@@ -71,29 +149,46 @@ def main() -> None:
     best_score = None
     best_metrics = None
 
-    t0 = time.time()
+    t0 = time.monotonic()  # MAX_SECONDS budget starts after the CSV load
     iters = 0
 
-    while time.time() - t0 < max_seconds:
-        iters += 1
-        p = dict(base)
-        for k, vals in space.items():
-            p[k] = random.choice(vals)
-
-        day_pnl = compute_day_pnl_for_sessions(candles, p, SPLIT_WINDOWS_UTC)
-        metrics = score_eval_pass(day_pnl)
-
-        score = (
-            metrics["pass_leq4_rate"],
-            -metrics["breach_rate"],
-            -metrics["timeout_rate"],
-            metrics["pass_leq5_rate"],
-        )
-
-        if best_score is None or score > best_score:
-            best_score = score
-            best = p
-            best_metrics = metrics
+    # cfgs are visited in the same order whatever WORKERS is; a pool only changes how
+    # many get scored before the budget runs out
+    _init_worker(candles)
+    ex = None
+    if workers > 1:
+        # fork where available: workers inherit the loaded columns instead of each
+        # unpickling a copy (spawn/forkserver, and the default from Python 3.14)
+        ctx = multiprocessing.get_context("fork") if "fork" in multiprocessing.get_all_start_methods() else None
+        ex = ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_init_worker, initargs=(candles,))
+
+    # The space (~55k cfgs) is small enough to enumerate: visit it in a SEED-shuffled
+    # order so every cfg is scored at most once and a long enough budget exhausts it.
+    keys = tuple(space)
+
+    def cfgs():
+        for vals in _cfg_order(space, seed):
+            p = dict(base)
+            p.update(zip(keys, vals))
+            yield p
+
+    try:
+        for p, metrics in _scored(ex, cfgs(), workers, t0 + max_seconds):
+            iters += 1
+            score = (
+                metrics["pass_leq4_rate"],
+                -metrics["breach_rate"],
+                -metrics["timeout_rate"],
+                metrics["pass_leq5_rate"],
+            )
+
+            if best_score is None or score > best_score:
+                best_score = score
+                best = p
+                best_metrics = metrics
+    finally:
+        if ex is not None:
+            ex.shutdown()
 
     out = {
         "seed": seed,
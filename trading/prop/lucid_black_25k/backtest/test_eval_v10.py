@@ -0,0 +1,129 @@
+import random
+
+from trading.prop.lucid_black_25k.backtest.eval_v10_eval import Eval25kSpec, score_eval_pass
+
+
+def _ref_score(day_pnl, horizons, max_scan_days):
+    """Per-start scan with per-day key lookups (the dict formulation score_eval_pass replaced)."""
+    spec = Eval25kSpec()
+    keys = list(day_pnl)
+    totals = breaches = timeouts = 0
+    pass_counts = {h: 0 for h in horizons}
+    for s in range(len(keys)):
+        if s + max_scan_days >= len(keys):
+            break
+        totals += 1
+        total, largest = 0.0, float("-inf")
+        bal = high = spec.start_balance
+        outcome = None
+        for k in range(max_scan_days):
+            pnl = float(day_pnl.get(keys[s + k], 0.0))
+            total += pnl
+            largest = max(largest, pnl)
+            bal += pnl
+            high = max(high, bal)
+            mll = spec.locked_mll_balance if high >= spec.initial_trail_balance else high - spec.max_loss_limit
+            if bal <= mll:
+                outcome = "breach"
+                break
+            if total >= spec.profit_target and total > 0 and largest / total <= spec.consistency_cap:
+                outcome = k + 1
+                break
+        if outcome == "breach":
+            breaches += 1
+        elif outcome is None:
+            timeouts += 1
+        else:
+            for h in horizons:
+                pass_counts[h] += outcome <= h
+    out = {
+        "samples": totals,
+        "breach_rate": breaches / totals if totals else 0.0,
+        "timeout_rate": timeouts / totals if totals else 0.0,
+    }
+    for h in horizons:
+        out[f"pass_leq{h}_rate"] = pass_counts[h] / totals if totals else 0.0
+    return out
+
+
+def test_score_eval_pass_matches_dict_scan():
+    rng = random.Random(5)
+    seen = set()  # outcomes reached, so the comparison isn't vacuous
+    for _ in range(200):
+        n = rng.randint(0, 80)
+        day_pnl = {f"d{i:03d}": rng.choice([0.0, rng.uniform(-450.0, 500.0), rng.uniform(-50.0, 1300.0)]) for i in range(n)}
+        horizons = rng.choice([(4, 5, 7, 10), (1, 3, 15)])
+        max_scan_days = rng.choice([5, 10, 15])
+        got = score_eval_pass(day_pnl, horizons=horizons, max_scan_days=max_scan_days)
+        assert got == _ref_score(day_pnl, horizons, max_scan_days)
+        rates = {"breach": got["breach_rate"], "timeout": got["timeout_rate"], "pass": got[f"pass_leq{horizons[-1]}_rate"]}
+        seen.update(k for k, r in rates.items() if r)
+    assert seen == {"breach", "timeout", "pass"}
+
+
+def test_compute_day_pnl_for_sessions_matches_string_day_buckets():
+    from dataclasses import replace
+    from datetime import datetime, timedelta
+
+    from trading.backtest_harness.strategy_v9_open_snapback import generate_trades
+    from trading.backtest_harness.synthetic import random_walk_candles
+    from trading.backtest_harness.tv_csv import candles_to_arrays
+    from trading.prop.lucid_black_25k.backtest.eval_v10_eval import _params_from_cfg, compute_day_pnl_for_sessions
+
+    bars = random_walk_candles(6, 8000, step_s=300, move_ticks=60, wick_ticks=30)
+    # leave some days without bars so the weekday fill has work
+    candles = [c for c in bars if (c.ts // 86400) % 5]
+    params = {"risk": 250.0, "mt": 4, "atr_min": 4.0, "dev": 0.3, "stop": 0.5, "trail": 0.1, "tp": 1.2, "hold": 18}
+    sessions = [(13 * 60 + 30, 15 * 60), (19 * 60, 20 * 60 + 30)]
+
+    # reference: one 'YYYY-MM-DD' string per trade, then a date walk for the weekday fill
+    want = {}
+    base = _params_from_cfg(params)
+    for os, oe in sessions:
+        for t in generate_trades(candles, replace(base, open_start_min_utc=os, open_end_min_utc=oe)):
+            dk = datetime.utcfromtimestamp(t.exit_ts).strftime("%Y-%m-%d")
+            want[dk] = want.get(dk, 0.0) + float(t.pnl_dollars)
+    keys = sorted(want)
+    d, end = datetime.strptime(keys[0], "%Y-%m-%d"), datetime.strptime(keys[-1], "%Y-%m-%d")
+    while d <= end:
+        if d.weekday() < 5:
+            want.setdefault(d.strftime("%Y-%m-%d"), 0.0)
+        d += timedelta(days=1)
+    want = dict(sorted(want.items()))
+
+    assert len(want) > 10 and any(v == 0.0 for v in want.values())
+    got = compute_day_pnl_for_sessions(candles, params, sessions)
+    assert list(got.items()) == list(want.items())
+    assert compute_day_pnl_for_sessions(candles_to_arrays(candles), params, sessions) == got
+    assert compute_day_pnl_for_sessions(candles[:10], params, sessions) == {}
+
+
+def test_cfg_order_is_seeded_shuffle_regrouped_per_block():
+    import itertools
+
+    from trading.prop.lucid_black_25k.backtest.run_eval_v10_actions_search import ENTRY_BLOCK, ENTRY_KEYS, _cfg_order
+
+    # entry keys deliberately not first, and 420 cfgs so the last block is partial
+    space = {"risk": [150.0, 250.0, 300.0, 350.0], "dev": [0.3, 0.4, 0.5], "hold": [14, 18, 22, 26, 30], "atr_min": list(range(7))}
+    keys = list(space)
+    ent = [keys.index(k) for k in ENTRY_KEYS]
+    everything = list(itertools.product(*space.values()))
+    assert len(everything) % ENTRY_BLOCK
+
+    for seed in (1, 777):
+        got = _cfg_order(space, seed)
+        assert got == _cfg_order(space, seed)
+        assert sorted(got) == sorted(everything)
+
+        shuffled = list(everything)
+        random.Random(seed).shuffle(shuffled)
+        want = []
+        for i in range(0, len(shuffled), ENTRY_BLOCK):
+            # group each block by entry params, keeping the shuffled order inside a group
+            groups = {}
+            for cfg in shuffled[i : i + ENTRY_BLOCK]:
+                groups.setdefault(tuple(cfg[j] for j in ent), []).append(cfg)
+            for e in sorted(groups):
+                want.extend(groups[e])
+        assert got == want
+    assert _cfg_order(space, 1) != _cfg_order(space, 2)
@@ -9,6 +9,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
 from typing import Optional, Tuple
 
 
@@ -17,7 +18,7 @@ class Mode(str, Enum):
     FUNDED_PAYOUT = "FUNDED_PAYOUT"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Lucid25kRules:
     max_loss_limit: float = 1000.0
 
@@ -39,6 +40,12 @@ class Lucid25kRules:
     funded_tier2_threshold_profit: float = 1000.0
 
 
+@lru_cache(maxsize=1)
+def default_rules() -> Lucid25kRules:
+    """Shared Lucid25kRules() for the `rules=None` defaults (frozen, so safe to share)."""
+    return Lucid25kRules()
+
+
 def consistency_ratio(total_profit: float, largest_day_profit: float) -> float:
     if total_profit <= 0:
         return float("inf")